@@ -0,0 +1,61 @@
+import os
+from PyQt6.QtGui import QImage, QColor
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+
+def generate_library(root, movies=100, shows=10, seasons=3, episodes=10, podcasts=2, podcast_episodes=100, artwork=0):
+    """
+    Writes a synthetic media tree under root in the layout the scanner expects:
+    movies/, shows/<show>/Season N/ and podcasts/<podcast>/. Media files are empty,
+    since only their names and sizes matter to the scanner and the catalog.
+    Every artwork-th movie, show and podcast gets a local poster next to it
+    (0 for none), so both the local and the TMDb artwork paths are exercised.
+    Returns the number of files written.
+    """
+    written = 0
+
+    def touch(path, data=b''):
+        nonlocal written
+        with open(path, 'wb') as f:
+            f.write(data)
+        written += 1
+
+    poster = poster_bytes() if artwork else b''
+
+    movies_path = os.path.join(root, 'movies')
+    os.makedirs(movies_path, exist_ok=True)
+    for i in range(movies):
+        name = f'Synthetic Movie {i:05d} ({1950 + i % 75})'
+        touch(os.path.join(movies_path, name + '.mkv'))
+        if artwork and i % artwork == 0:
+            touch(os.path.join(movies_path, name + '-poster.jpg'), poster)
+
+    for i in range(shows):
+        show_name = f'Synthetic Show {i:04d}'
+        show_path = os.path.join(root, 'shows', show_name)
+        for season in range(1, seasons + 1):
+            season_path = os.path.join(show_path, f'Season {season}')
+            os.makedirs(season_path, exist_ok=True)
+            for episode in range(1, episodes + 1):
+                touch(os.path.join(season_path, f'{show_name} S{season:02d}E{episode:02d} - Episode {episode}.mkv'))
+        if artwork and i % artwork == 0:
+            touch(os.path.join(show_path, 'poster.jpg'), poster)
+
+    for i in range(podcasts):
+        podcast_path = os.path.join(root, 'podcasts', f'Synthetic Podcast {i:03d}')
+        os.makedirs(podcast_path, exist_ok=True)
+        for episode in range(podcast_episodes):
+            touch(os.path.join(podcast_path, f'{episode:05d} Daily Episode.mp3'))
+        if artwork and i % artwork == 0:
+            touch(os.path.join(podcast_path, 'folder.jpg'), poster)
+
+    return written
+
+def poster_bytes(width=500, height=750):
+    """A plain JPEG poster, encoded with Qt like the rest of the image pipeline."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor('#336699'))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, 'JPG')
+    return bytes(data)
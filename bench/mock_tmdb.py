@@ -0,0 +1,131 @@
+import json
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from bench.library import poster_bytes
+
+IMAGE_WIDTHS = {'w92': 92, 'w154': 154, 'w185': 185, 'w300': 300, 'w342': 342, 'w500': 500, 'w780': 780}
+
+def synthetic_id(title):
+    """A stable TMDb id for a title, so repeated runs resolve to the same ids."""
+    return zlib.crc32(title.encode('utf-8')) % 1000000 + 1
+
+class MockTMDbServer:
+    """
+    A local stand-in for the TMDb API and image host. Every search finds exactly one
+    result, every show has every season asked for with episodes_per_season episodes,
+    and every image path returns a JPEG of the requested width. Each request waits
+    latency seconds before it is answered, to model the round trip to TMDb.
+    Requests are counted per endpoint type in counts.
+    """
+    def __init__(self, latency=0.0, episodes_per_season=10):
+        self.latency = latency
+        self.episodes_per_season = episodes_per_season
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._images = {}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def api_url(self):
+        return f'http://127.0.0.1:{self._server.server_port}/3'
+
+    @property
+    def image_url(self):
+        return f'http://127.0.0.1:{self._server.server_port}/t/p'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts.clear()
+
+    def count(self, kind):
+        with self._lock:
+            self.counts[kind] += 1
+
+    def image(self, variant):
+        with self._lock:
+            if variant not in self._images:
+                width = IMAGE_WIDTHS.get(variant, 500)
+                self._images[variant] = poster_bytes(width, width * 3 // 2)
+            return self._images[variant]
+
+    def respond(self, path, query):
+        """Returns (kind, JSON data) for an API request, or (kind, None) for an unknown endpoint."""
+        if re.match(r'^/(movie|tv)/changes$', path):
+            return 'changes', {'results': [], 'page': 1, 'total_pages': 1}
+        if path.startswith('/search/'):
+            item_id = synthetic_id(query.get('query', ''))
+            return 'search', {'results': [{'id': item_id, 'poster_path': f'/poster{item_id}.jpg'}]}
+        if path.startswith('/find/'):
+            return 'find', {'movie_results': [], 'tv_results': []}
+        match = re.match(r'^/movie/(\d+)$', path)
+        if match:
+            return 'movie', {'id': int(match.group(1)), 'poster_path': f'/poster{match.group(1)}.jpg'}
+        match = re.match(r'^/tv/(\d+)$', path)
+        if match:
+            show_id = int(match.group(1))
+            data = {'id': show_id, 'poster_path': f'/poster{show_id}.jpg'}
+            for appended in filter(None, query.get('append_to_response', '').split(',')):
+                season_number = int(appended.split('/')[1])
+                data[appended] = {
+                    'poster_path': f'/season{show_id}_{season_number}.jpg',
+                    'episodes': [{'episode_number': episode, 'name': f'Episode {episode}',
+                                  'still_path': f'/still{show_id}_{season_number}_{episode}.jpg'}
+                                 for episode in range(1, self.episodes_per_season + 1)],
+                }
+            return 'show', data
+        return 'other', None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlparse(self.path)
+                match = re.match(r'^/t/p/(\w+)/', url.path)
+                if match:
+                    server.count('image')
+                    self.send(200, server.image(match.group(1)), 'image/jpeg')
+                    return
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                path = url.path[2:] if url.path.startswith('/3/') else url.path
+                kind, data = server.respond(path, query)
+                server.count(kind)
+                if data is None:
+                    self.send(404, b'{}', 'application/json')
+                else:
+                    self.send(200, json.dumps(data).encode('utf-8'), 'application/json')
+
+            def send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,191 @@
+"""
+End-to-end benchmark: generates a synthetic library, then measures the scan, the
+metadata fetch against a local mock TMDb server (cold, then warm from the catalog),
+populate_ui and the artwork loads it starts, on the offscreen Qt platform.
+
+    python -m bench.run --movies 5000 --shows 200 --podcast-episodes 2000 --latency 40
+
+Every stage reports wall time, HTTP requests, peak RSS and Python allocations.
+Allocation tracing slows Python code down; pass --no-trace for wall times only.
+"""
+import argparse
+import copy
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from bench.library import generate_library
+from bench.mock_tmdb import MockTMDbServer
+
+# Longest time the artwork stage waits for outstanding image loads
+ARTWORK_TIMEOUT = 300
+
+def reset_peak_rss():
+    """Resets the kernel's peak RSS counter of this process, where Linux allows it."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    """Peak resident set size in MB since the last reset, or over the whole run where it cannot be reset."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+@contextlib.contextmanager
+def measure(name, results, server, trace):
+    """Records the wall time, requests, peak RSS and allocations of the code in the with block."""
+    server.reset_counts()
+    reset_peak_rss()
+    if trace:
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = {'stage': name}
+    yield result
+    result['wall_s'] = round(time.perf_counter() - start, 3)
+    result['requests'] = sum(server.counts.values())
+    result['requests_by_type'] = dict(server.counts)
+    peak = peak_rss_mb()
+    result['peak_rss_mb'] = round(peak, 1) if peak is not None else None
+    if trace:
+        traced_after, traced_peak = tracemalloc.get_traced_memory()
+        result['alloc_net_mb'] = round((traced_after - traced_before) / (1024 * 1024), 2)
+        result['alloc_peak_mb'] = round((traced_peak - traced_before) / (1024 * 1024), 2)
+    results.append(result)
+
+def isolate(state_dir, server, concurrency):
+    """
+    Points every file the app keeps state in, its config and the TMDb image host at
+    state_dir and the mock server, so a run neither reads nor touches the real ones.
+    Must run before main is imported.
+    """
+    import config
+    config.CONFIG_FILE_PATH = os.path.join(state_dir, 'config.json')
+    with open(config.CONFIG_FILE_PATH, 'w') as f:
+        json.dump({'metadata_concurrency': concurrency, 'metadata_sync': False}, f)
+    # Imported only now, since some of them read settings at import time
+    import catalog, response_cache, title_index, scanner, cache, worker
+    catalog.CATALOG_PATH = os.path.join(state_dir, '.catalog.db')
+    response_cache.RESPONSE_CACHE_PATH = os.path.join(state_dir, '.api_cache.db')
+    title_index.TITLE_INDEX_PATH = os.path.join(state_dir, '.title_index.db')
+    scanner.SNAPSHOT_PATH = os.path.join(state_dir, '.scan_snapshot.json')
+    cache.CACHE_DIR = os.path.join(state_dir, '.cache')
+    cache.PACK_DIR = os.path.join(cache.CACHE_DIR, 'packs')
+    worker.IMAGE_BASE_URL = server.image_url
+
+def run_metadata(media, server, concurrency):
+    from tmdb import TMDbAPI
+    from worker import MetadataWorker, WorkerSignals
+    movies, shows, podcasts = copy.deepcopy(media)
+    tmdb_api = TMDbAPI('benchmark', base_url=server.api_url, pool_size=concurrency)
+    MetadataWorker(movies, shows, podcasts, WorkerSignals(), tmdb_api=tmdb_api,
+                   max_workers=concurrency, sync=False).run()
+    return movies, shows, podcasts
+
+def run(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    root = tempfile.mkdtemp(prefix='codex-bench-')
+    library = os.path.join(root, 'library')
+    state_dir = os.path.join(root, 'state')
+    os.makedirs(state_dir)
+    server = MockTMDbServer(args.latency / 1000, args.episodes).start()
+    isolate(state_dir, server, args.concurrency)
+    if args.trace:
+        tracemalloc.start()
+    results = []
+    try:
+        with measure('generate', results, server, args.trace) as stage:
+            stage['files'] = generate_library(library, args.movies, args.shows, args.seasons, args.episodes,
+                                              args.podcasts, args.podcast_episodes, args.artwork)
+
+        import scanner
+        with measure('scan', results, server, args.trace) as stage:
+            media = scanner.scan_media(library)
+            stage['items'] = sum(len(items) for items in media)
+
+        with measure('metadata_cold', results, server, args.trace):
+            run_metadata(media, server, args.concurrency)
+        with measure('metadata_warm', results, server, args.trace):
+            movies, shows, podcasts = run_metadata(media, server, args.concurrency)
+
+        if not args.skip_ui:
+            import main
+            codex = main.Codex(load_media=False)
+            codex.show()
+            app.processEvents()
+            with measure('populate_ui', results, server, args.trace):
+                codex.populate_ui(movies, shows, podcasts)
+                # Include the layout and first paint the population causes
+                app.processEvents()
+            with measure('artwork', results, server, args.trace) as stage:
+                deadline = time.monotonic() + ARTWORK_TIMEOUT
+                while codex.image_loader.in_flight and time.monotonic() < deadline:
+                    app.processEvents()
+                    time.sleep(0.005)
+                stage['pending'] = len(codex.image_loader.in_flight)
+            codex.close()
+    finally:
+        server.stop()
+        if args.trace:
+            tracemalloc.stop()
+        if args.keep:
+            print(f"Benchmark files kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+def print_results(results):
+    print()
+    print(f"{'stage':<15}{'wall s':>9}{'requests':>10}{'peak RSS MB':>13}{'alloc net MB':>14}{'alloc peak MB':>15}")
+    for result in results:
+        print(f"{result['stage']:<15}{result['wall_s']:>9.3f}{result['requests']:>10}"
+              f"{str(result['peak_rss_mb']):>13}{str(result.get('alloc_net_mb', '-')):>14}{str(result.get('alloc_peak_mb', '-')):>15}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Codex end-to-end benchmark on a synthetic library.')
+    parser.add_argument('--movies', type=int, default=1000)
+    parser.add_argument('--shows', type=int, default=50)
+    parser.add_argument('--seasons', type=int, default=3, help='seasons per show')
+    parser.add_argument('--episodes', type=int, default=10, help='episodes per season')
+    parser.add_argument('--podcasts', type=int, default=3)
+    parser.add_argument('--podcast-episodes', type=int, default=500, help='episodes per podcast')
+    parser.add_argument('--artwork', type=int, default=0, help='give every Nth item local artwork (0 for none)')
+    parser.add_argument('--latency', type=float, default=20, help='mock TMDb response latency in ms')
+    parser.add_argument('--concurrency', type=int, default=8, help='metadata_concurrency setting')
+    parser.add_argument('--no-trace', dest='trace', action='store_false', help='skip tracemalloc allocation tracking')
+    parser.add_argument('--skip-ui', action='store_true', help='skip the populate_ui and artwork stages')
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--keep', action='store_true', help='keep the generated library and state')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    results = run(args)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'arguments': vars(args), 'results': results}, f, indent=2)
@@ -1,40 +1,364 @@
 import os
 import hashlib
-from PyQt6.QtGui import QPixmap
+import json
+import threading
+import time
+from collections import OrderedDict
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from config import get_setting
+from pack_store import PackStore
 
 CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache')
+MANIFEST_NAME = 'manifest.json'
+# Where the 'packs' cache_backend keeps its pack files and index
+PACK_DIR = os.path.join(CACHE_DIR, 'packs')
+# Memory budget for decoded pixmaps, overridable with 'pixmap_cache_mb' in config.json
+DEFAULT_PIXMAP_CACHE_MB = 256
+# Disk budget for cached images, overridable with 'disk_cache_mb' in config.json
+DEFAULT_DISK_CACHE_MB = 1024
+# Most entries removed by one incremental eviction step
+EVICTION_BATCH = 32
+# Temporary files older than this many seconds were left behind by a crash
+STALE_TEMP_AGE = 3600
 
-def get_cache_path(poster_path):
-    """Generate a unique, safe filename for a given poster path."""
+def get_cache_name(poster_path, size=None, variant=None):
+    """
+    Generate a unique, safe filename for a given poster path. With a (width, height)
+    size, this is the name of the derivative pre-scaled to that size. Otherwise it is
+    the name of the downloaded TMDb size variant, e.g. 'w342'; w500 downloads keep the
+    plain name they always had.
+    """
     if not poster_path:
         return None
     # Create a hash of the poster path to use as a filename
     hasher = hashlib.sha1(poster_path.encode('utf-8'))
-    filename = f"{hasher.hexdigest()}.jpg"
-    return os.path.join(CACHE_DIR, filename)
+    if size:
+        return f"{hasher.hexdigest()}_{size[0]}x{size[1]}.jpg"
+    if variant and variant != 'w500':
+        return f"{hasher.hexdigest()}_{variant}.jpg"
+    return f"{hasher.hexdigest()}.jpg"
 
-def get_image_from_cache(poster_path):
+class DiskCache:
     """
-    Tries to load a QPixmap from the cache.
-    Returns the QPixmap if found, otherwise None.
+    The on-disk image cache: one file per image in CACHE_DIR, indexed by a manifest
+    that records the size and last access time of every entry. The manifest is read
+    once at startup, so lookups never touch the file system. Entries are kept in
+    access order, so once the cache grows beyond its byte budget, evict() removes
+    the least recently used ones a small batch at a time from the front.
+    Reads only move an entry in memory; their access times reach the manifest when
+    save() is called with access_times, i.e. on shutdown. Files written after the
+    last manifest save are missing from it after a crash; the first evict() of a
+    session reconciles the manifest with the directory to pick them up.
+    Used from the image worker threads, so all state is guarded by a lock.
     """
-    if not os.path.exists(CACHE_DIR):
-        os.makedirs(CACHE_DIR)
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or CACHE_DIR
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_DISK_CACHE_MB * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # name -> [size, last_access], least recently used first
+        self.total_bytes = 0
+        # Entries were added or removed / only read since the manifest was last written
+        self._dirty = False
+        self._touched = False
+        self._reconciled = False
+        # Serializes manifest writes, so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_manifest()
 
-    cache_path = get_cache_path(poster_path)
-    if cache_path and os.path.exists(cache_path):
-        pixmap = QPixmap()
-        if pixmap.load(cache_path):
-            return pixmap
-    return None
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                entries = [(name, list(entry)) for name, entry in json.load(f).items()]
+            self._entries = OrderedDict(sorted(entries, key=lambda item: item[1][1]))
+        except (OSError, ValueError, AttributeError, IndexError, TypeError):
+            self._rebuild_manifest()
+        self.total_bytes = sum(size for size, _ in self._entries.values())
 
-def save_image_to_cache(poster_path, image_data):
-    """Saves image data to the cache."""
-    cache_path = get_cache_path(poster_path)
-    if cache_path:
+    def _rebuild_manifest(self):
+        # A single directory scan, only for a cache without a usable manifest,
+        # e.g. one written before the manifest existed
+        self._entries = OrderedDict(sorted(self._scan_files(), key=lambda item: item[1][1]))
+        self._reconciled = True
+        self._dirty = True
+
+    def _scan_files(self):
+        """Returns (name, [size, mtime]) for every cached file, removing stale temporary files."""
+        files = []
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name == MANIFEST_NAME or not entry.is_file():
+                    continue
+                try:
+                    stat_result = entry.stat()
+                    if entry.name.endswith('.tmp'):
+                        if now - stat_result.st_mtime > STALE_TEMP_AGE:
+                            os.remove(entry.path)
+                        continue
+                except OSError:
+                    continue
+                files.append((entry.name, [stat_result.st_size, stat_result.st_mtime]))
+        return files
+
+    def reconcile(self):
+        """
+        Brings the manifest in line with the directory: files it does not know, e.g. ones
+        written after the last save before a crash, are added as the least recently used
+        entries, and entries whose file is gone are dropped.
+        """
+        started = time.time()
+        try:
+            files = self._scan_files()
+        except OSError as e:
+            print(f"Error reconciling the disk cache: {e}")
+            return
+        on_disk = {name for name, _ in files}
+        with self._lock:
+            for name, entry in sorted(files, key=lambda item: item[1][1], reverse=True):
+                if name not in self._entries:
+                    self._entries[name] = entry
+                    self._entries.move_to_end(name, last=False)
+                    self.total_bytes += entry[0]
+                    self._dirty = True
+            # Entries written while the directory was being listed may be missing from it
+            for name in [name for name, (_, last_access) in self._entries.items()
+                         if name not in on_disk and last_access < started]:
+                self.total_bytes -= self._entries.pop(name)[0]
+                self._dirty = True
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._entries
+
+    def read(self, name):
+        """Returns the bytes stored under a name, or None if there are none."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            entry[1] = time.time()
+            self._entries.move_to_end(name)
+            self._touched = True
         try:
-            with open(cache_path, 'wb') as f:
-                f.write(image_data)
-        except IOError as e:
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            # Removed behind our back; forget it
+            self._forget(name)
+            return None
+
+    def write(self, name, data):
+        # Written under a temporary name and renamed into place, so readers and racing
+        # writers never see a partial file
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
             print(f"Error saving image to cache: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous:
+                self.total_bytes -= previous[0]
+            self._entries[name] = [len(data), time.time()]
+            self.total_bytes += len(data)
+            self._dirty = True
+
+    def _forget(self, name):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry:
+                self.total_bytes -= entry[0]
+                self._dirty = True
+
+    def evict(self, max_entries=EVICTION_BATCH):
+        """
+        Removes up to max_entries of the least recently used entries while the cache is
+        over budget. Returns the number removed; call again until it returns 0.
+        The first call of a session reconciles the manifest with the directory first.
+        """
+        if not self._reconciled:
+            self._reconciled = True
+            self.reconcile()
+        with self._lock:
+            excess = self.total_bytes - self.max_bytes
+            if excess <= 0:
+                return 0
+            victims = []
+            for name, (size, _) in self._entries.items():
+                if excess <= 0 or len(victims) >= max_entries:
+                    break
+                victims.append(name)
+                excess -= size
+        for name in victims:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing cached file: {e}")
+                continue
+            self._forget(name)
+        return len(victims)
+
+    def save(self, access_times=True):
+        """
+        Writes the manifest if entries were added or removed since it was last written,
+        or, with access_times, if entries were only read.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not (self._dirty or (access_times and self._touched)):
+                    return
+                entries = dict(self._entries)
+                self._dirty = False
+                self._touched = False
+            temp_path = f"{self.manifest_path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(temp_path, self.manifest_path)
+            except OSError as e:
+                print(f"Error saving cache manifest: {e}")
+                with self._lock:
+                    self._dirty = True
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+def get_disk_cache():
+    """
+    Returns the shared disk cache, creating it on first use: a DiskCache of single files,
+    or a PackStore when 'cache_backend' is set to 'packs' in config.json.
+    """
+    global _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            max_bytes = get_setting('disk_cache_mb', DEFAULT_DISK_CACHE_MB) * 1024 * 1024
+            if get_setting('cache_backend', 'files') == 'packs':
+                _disk_cache = PackStore(PACK_DIR, max_bytes)
+            else:
+                _disk_cache = DiskCache(max_bytes=max_bytes)
+    return _disk_cache
+
+def load_from_cache(poster_path, size=None, variant=None):
+    """Returns the cached bytes (or a memoryview of them) of an image variant or derivative, or None."""
+    return get_disk_cache().read(get_cache_name(poster_path, size, variant))
+
+def save_image_to_cache(poster_path, image_data, variant=None):
+    """Saves image data to the cache."""
+    cache_name = get_cache_name(poster_path, variant=variant)
+    if cache_name:
+        get_disk_cache().write(cache_name, image_data)
+
+def save_derivative_to_cache(poster_path, size, image):
+    """Saves a QImage already scaled to size as the derivative of a poster path."""
+    cache_name = get_cache_name(poster_path, size)
+    if not cache_name:
+        return
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if image.save(buffer, 'JPG', 90):
+        get_disk_cache().write(cache_name, bytes(data))
+    else:
+        print(f"Error encoding image derivative: {cache_name}")
+
+def pixmap_cost(pixmap):
+    """Approximate memory used by a decoded pixmap, in bytes."""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+class PixmapCache:
+    """
+    An in-memory LRU cache of decoded pixmaps, keyed by image path and bounded by the
+    bytes the pixmaps take up rather than by their number. The least recently used
+    entries are dropped once the budget is exceeded; their images are reloaded from
+    the disk cache the next time they are requested.
+    Supports the dict operations the cards used on the plain dict it replaces.
+    Only used from the GUI thread, like the QPixmaps it holds.
+    """
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_PIXMAP_CACHE_MB * 1024 * 1024
+        self._entries = OrderedDict() # key -> (pixmap, cost), least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def __getitem__(self, key):
+        pixmap = self.get(key)
+        if pixmap is None:
+            raise KeyError(key)
+        return pixmap
+
+    def __setitem__(self, key, pixmap):
+        self.pop(key)
+        cost = pixmap_cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        self._entries[key] = (pixmap, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.total_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+_pixmap_cache = None
 
+def get_pixmap_cache():
+    """Returns the PixmapCache shared by all cards, creating it on first use."""
+    global _pixmap_cache
+    if _pixmap_cache is None:
+        _pixmap_cache = PixmapCache(get_setting('pixmap_cache_mb', DEFAULT_PIXMAP_CACHE_MB) * 1024 * 1024)
+    return _pixmap_cache
@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), '.catalog.db')
+
+def file_signature(path):
+    """
+    Returns the (size, mtime_ns) pair used to detect changed library entries,
+    or None if the path can no longer be stat'ed.
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+class MetadataCatalog:
+    """
+    A persistent SQLite catalog of resolved TMDb metadata.
+
+    Entries are keyed on the local path of a movie file, show directory or
+    season directory, and are only considered valid while the path's size and
+    mtime still match the values recorded when the entry was stored. This lets
+    MetadataWorker skip TMDb entirely for parts of the library that did not change.
+    """
+    def __init__(self, path=None):
+        self.path = path or CATALOG_PATH
+        # The worker may touch the catalog from pool threads, so share a single
+        # connection and serialize access to it ourselves.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " path TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " size INTEGER,"
+            " mtime INTEGER,"
+            " tmdb_id INTEGER,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def tmdb_ids(self, kind):
+        """Returns the set of TMDb ids stored for entries of a kind."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT tmdb_id FROM entries WHERE kind = ? AND tmdb_id IS NOT NULL", (kind,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def lookup(self, kind, path, signature):
+        """
+        Returns the stored data for a path if it is still valid for the given
+        signature, otherwise None.
+        """
+        if signature is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, data FROM entries WHERE path = ? AND kind = ?",
+                (path, kind)
+            ).fetchone()
+        if row is None or (row[0], row[1]) != tuple(signature):
+            return None
+        try:
+            return json.loads(row[2])
+        except ValueError:
+            return None
+
+    def store(self, kind, path, signature, tmdb_id, data):
+        """Records resolved metadata for a path. Changes are written on commit()."""
+        if signature is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (path, kind, size, mtime, tmdb_id, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, kind, signature[0], signature[1], tmdb_id, json.dumps(data))
+            )
+
+    def prune(self, valid_paths):
+        """Removes entries whose path is no longer part of the library."""
+        valid_paths = set(valid_paths)
+        with self._lock:
+            stale = [path for (path,) in self._conn.execute("SELECT path FROM entries")
+                     if path not in valid_paths]
+            self._conn.executemany("DELETE FROM entries WHERE path = ?", [(path,) for path in stale])
+        return len(stale)
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
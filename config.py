@@ -7,18 +7,28 @@ import os
 CONFIG_FILE_NAME = 'config.json'
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), CONFIG_FILE_NAME)
 
-def save_media_path(path):
-    """Saves the media path to the config file."""
-    with open(CONFIG_FILE_PATH, 'w') as f:
-        json.dump({'media_path': path}, f)
-
-def load_media_path():
-    """Loads the media path from the config file."""
+def load_config():
+    """Loads all settings from the config file."""
     if not os.path.exists(CONFIG_FILE_PATH):
-        return None
+        return {}
     try:
         with open(CONFIG_FILE_PATH, 'r') as f:
             config = json.load(f)
-            return config.get('media_path')
+            return config if isinstance(config, dict) else {}
     except (json.JSONDecodeError, IOError):
-        return None
+        return {}
+
+def get_setting(key, default=None):
+    """Returns a single setting from the config file, or the default if it is not set."""
+    return load_config().get(key, default)
+
+def save_media_path(path):
+    """Saves the media path to the config file, keeping any other settings."""
+    config = load_config()
+    config['media_path'] = path
+    with open(CONFIG_FILE_PATH, 'w') as f:
+        json.dump(config, f)
+
+def load_media_path():
+    """Loads the media path from the config file."""
+    return load_config().get('media_path')
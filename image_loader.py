@@ -0,0 +1,127 @@
+import math
+import weakref
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import QThreadPool
+from cache import get_pixmap_cache
+from config import get_setting
+from worker import ImageLoadWorker, WorkerSignals
+
+# Download priorities, highest first. QThreadPool runs queued work in priority order.
+PRIORITY_VISIBLE = 2    # The card is on screen right now
+PRIORITY_NEIGHBOUR = 1  # The card is next to the focused one and will likely be shown next
+PRIORITY_PREFETCH = 0   # Background warm-up of the cache
+
+# Display sizes images are decoded at, in logical pixels: card posters and episode stills
+POSTER_SIZE = (200, 300)
+STILL_SIZE = (200, 112)
+
+def device_size(size, dpr=1.0):
+    """A logical (width, height) size in device pixels for a device pixel ratio."""
+    return math.ceil(size[0] * dpr), math.ceil(size[1] * dpr)
+
+def image_key(path, size, dpr=1.0):
+    """The in-memory cache key of an image at a display size."""
+    width, height = device_size(size, dpr)
+    return f"{path}@{width}x{height}"
+
+class ImageLoader:
+    """
+    The single place images are loaded from. A request is answered from the in-memory
+    pixmap cache, or else loaded at its display size by an ImageLoadWorker, which reads
+    the disk cache or downloads and does all decoding and scaling off the GUI thread.
+    Concurrent requests for the same image share one load, whose result is handed to
+    every subscriber. A queued load is moved up when a higher priority request for it
+    comes in.
+    """
+    def __init__(self, pixmap_cache=None, max_threads=None):
+        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else get_pixmap_cache()
+        self.threadpool = QThreadPool()
+        self.threadpool.setMaxThreadCount(max_threads or get_setting('image_pool_size', 8))
+        self.signals = WorkerSignals()
+        self.signals.image_loaded.connect(self.on_image_loaded)
+        self.signals.image_failed.connect(self.on_image_failed)
+        # key -> {'path': str, 'worker': ImageLoadWorker, 'priority': int, 'callbacks': [...]}
+        self.in_flight = {}
+
+    def request(self, path, callback=None, priority=PRIORITY_VISIBLE, size=POSTER_SIZE, local=False, dpr=1.0):
+        """
+        Asks for the image at a TMDb path, or at a local file path when local is set,
+        scaled to fit size on a screen with device pixel ratio dpr. Only a TMDb size
+        variant that big is downloaded. callback(path, pixmap) is called once the image is
+        available, straight away if it is already cached, or with None if it could not
+        be loaded. Callbacks bound to a widget are held weakly, so a pending request
+        never keeps a card alive.
+        Returns the pixmap if it was available immediately, otherwise None.
+        """
+        if not path:
+            return None
+        key = image_key(path, size, dpr)
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is not None:
+            if callback is not None:
+                callback(path, pixmap)
+            return pixmap
+
+        entry = self.in_flight.get(key)
+        if entry is None:
+            worker = ImageLoadWorker(key, path, device_size(size, dpr), self.signals, local)
+            worker.setAutoDelete(False)
+            entry = {'path': path, 'dpr': dpr, 'worker': worker, 'priority': priority, 'callbacks': []}
+            self.in_flight[key] = entry
+            self.threadpool.start(worker, priority)
+        elif priority > entry['priority']:
+            self.prioritize(path, priority, size, dpr)
+        if callback is not None:
+            ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+            entry['callbacks'].append(ref)
+        return None
+
+    def prefetch(self, paths, size=POSTER_SIZE, dpr=1.0):
+        """Queues paths at the lowest priority, only to warm the cache."""
+        for path in paths:
+            if path and image_key(path, size, dpr) not in self.pixmap_cache:
+                self.request(path, priority=PRIORITY_PREFETCH, size=size, dpr=dpr)
+
+    def prioritize(self, path, priority, size=POSTER_SIZE, dpr=1.0):
+        """Moves a queued load up to the given priority. Started loads are left alone."""
+        entry = self.in_flight.get(image_key(path, size, dpr))
+        if entry is None or priority <= entry['priority']:
+            return
+        entry['priority'] = priority
+        if self.threadpool.tryTake(entry['worker']):
+            self.threadpool.start(entry['worker'], priority)
+
+    def on_image_loaded(self, key, image):
+        # The image arrives decoded and sized; the GUI thread only uploads it
+        entry = self.in_flight.pop(key, None)
+        pixmap = QPixmap.fromImage(image)
+        if entry is not None:
+            pixmap.setDevicePixelRatio(entry['dpr'])
+        self.pixmap_cache[key] = pixmap
+        self.notify(entry, pixmap)
+
+    def on_image_failed(self, key):
+        # Forget the request so the next one for this image tries again
+        self.notify(self.in_flight.pop(key, None), None)
+
+    def notify(self, entry, pixmap):
+        if entry is None:
+            return
+        for ref in entry['callbacks']:
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback(entry['path'], pixmap)
+            except RuntimeError:
+                # The widget behind the callback was deleted by Qt in the meantime
+                pass
+
+_image_loader = None
+
+def get_image_loader():
+    """Returns the application wide ImageLoader, creating it on first use."""
+    global _image_loader
+    if _image_loader is None:
+        _image_loader = ImageLoader()
+    return _image_loader
@@ -0,0 +1,197 @@
+import bisect
+import json
+import os
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QEvent, QTimer, QPoint, QRect
+from PyQt6.QtGui import QRegion
+from PyQt6.QtWidgets import QApplication, QWidget
+from config import get_setting
+
+INSTRUMENTATION_DUMP_PATH = os.path.join(os.path.dirname(__file__), 'instrumentation.json')
+# Samples kept per metric; older ones fall out of the histogram
+SAMPLE_WINDOW = 1000
+# Upper bounds in ms of the histogram buckets; a last bucket takes everything above
+BUCKET_BOUNDS = [8, 17, 33, 50, 100, 250, 500, 1000]
+# Milliseconds between heartbeat ticks used to detect GUI thread stalls
+HEARTBEAT_INTERVAL = 50
+DEFAULT_STALL_THRESHOLD_MS = 100
+# A key press not followed by a paint within this many seconds changed nothing on screen and is dropped
+KEY_LATENCY_TIMEOUT = 1.0
+# Paints of a deck view further apart than this are separate bursts, not consecutive frames
+FRAME_GAP = 0.25
+
+class Metric:
+    """A rolling window of samples in milliseconds with a histogram over it."""
+    def __init__(self, name):
+        self.name = name
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.total = 0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.total += 1
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    def histogram(self):
+        """Sample counts per bucket of BUCKET_BOUNDS, plus one for anything slower."""
+        counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        for value in self.samples:
+            counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        return counts
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'p50_ms': round(self.percentile(0.5), 2),
+            'p95_ms': round(self.percentile(0.95), 2),
+            'max_ms': round(max(self.samples, default=0.0), 2),
+        }
+
+class Instrumentation(QObject):
+    """
+    Measures UI responsiveness while enabled:
+    - key latency: from a key press to the end of the first paint after it of the
+      widget that received the key, a deck view or a key target such as the
+      current page (or a child of one),
+    - deck frames: the interval between consecutive paints of the deck views,
+    - stalls: how late a heartbeat timer fires when the GUI thread is blocked
+      for longer than the stall threshold.
+    Key presses and paints are observed through an application event filter,
+    which is only installed while enabled, so it costs nothing otherwise.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.enabled = False
+        self.stall_threshold = get_setting('stall_threshold_ms', DEFAULT_STALL_THRESHOLD_MS)
+        self.key_latency = Metric('key_to_paint')
+        self.frame_interval = Metric('deck_frame_interval')
+        self.stalls = Metric('gui_stall')
+        self.metrics = [self.key_latency, self.frame_interval, self.stalls]
+        self.frame_widgets = set()
+        self.ignored_widgets = set()
+        self.key_targets = lambda: ()
+        self.pending_key = None
+        self.key_receiver = None
+        self.measuring_paint = False
+        self.last_frame = {}
+        self.last_heartbeat = 0
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_INTERVAL)
+        self.heartbeat.timeout.connect(self.on_heartbeat)
+
+    def watch_frames(self, widget):
+        """Counts the paints of widget, e.g. a deck view's viewport, as animation frames."""
+        self.frame_widgets.add(widget)
+
+    def ignore(self, widget):
+        """
+        Paints of widget, such as the overlay itself, do not end a key latency measurement,
+        and neither do paints of the widgets under it that are confined to its area.
+        """
+        self.ignored_widgets.add(widget)
+
+    def set_key_targets(self, targets):
+        """targets returns the widgets whose paints, or their children's, show the response to a key."""
+        self.key_targets = targets
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        app = QApplication.instance()
+        if enabled:
+            app.installEventFilter(self)
+            self.last_heartbeat = time.perf_counter()
+            self.heartbeat.start()
+        else:
+            app.removeEventFilter(self)
+            self.heartbeat.stop()
+            self.pending_key = None
+            self.key_receiver = None
+            self.last_frame = {}
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type == QEvent.Type.KeyPress:
+            # A key press travels from the window through several widgets; the first widget
+            # seen starts the measurement, unless one is already running
+            now = time.perf_counter()
+            if isinstance(obj, QWidget) and (self.pending_key is None or now - self.pending_key > KEY_LATENCY_TIMEOUT):
+                self.pending_key = now
+                self.key_receiver = obj
+        elif event_type == QEvent.Type.Paint:
+            now = time.perf_counter()
+            if obj in self.frame_widgets:
+                last = self.last_frame.get(obj)
+                if last is not None and now - last < FRAME_GAP:
+                    self.frame_interval.add((now - last) * 1000)
+                self.last_frame[obj] = now
+            if self.pending_key is not None and not self.measuring_paint and self.shows_key_response(obj, event):
+                if now - self.pending_key > KEY_LATENCY_TIMEOUT:
+                    self.pending_key = None
+                else:
+                    # The filter runs before the paint; the zero timer fires once the repaint is done
+                    self.measuring_paint = True
+                    QTimer.singleShot(0, self.on_paint_finished)
+        return False
+
+    def shows_key_response(self, obj, event):
+        """Whether a paint of obj can show the response to the pending key press."""
+        if obj in self.ignored_widgets or not isinstance(obj, QWidget):
+            return False
+        for widget in self.ignored_widgets:
+            # An ignored widget's update() first repaints what lies under it, e.g. its parent
+            if widget.isVisible() and widget.window() is obj.window():
+                area = QRect(obj.mapFromGlobal(widget.mapToGlobal(QPoint(0, 0))), widget.size())
+                if event.region().subtracted(QRegion(area)).isEmpty():
+                    return False
+        if obj is self.key_receiver or obj in self.frame_widgets:
+            return True
+        return any(target is obj or target.isAncestorOf(obj) for target in self.key_targets() if target is not None)
+
+    def on_paint_finished(self):
+        self.measuring_paint = False
+        if self.pending_key is not None:
+            self.key_latency.add((time.perf_counter() - self.pending_key) * 1000)
+            self.pending_key = None
+
+    def on_heartbeat(self):
+        now = time.perf_counter()
+        late = (now - self.last_heartbeat) * 1000 - HEARTBEAT_INTERVAL
+        self.last_heartbeat = now
+        if late > self.stall_threshold:
+            self.stalls.add(late)
+
+    def dump(self, path=INSTRUMENTATION_DUMP_PATH):
+        """Writes the summaries, histograms and samples of all metrics to a JSON file."""
+        data = {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'bucket_bounds_ms': BUCKET_BOUNDS,
+            'stall_threshold_ms': self.stall_threshold,
+            'metrics': {
+                metric.name: dict(metric.summary(), histogram=metric.histogram(),
+                                  samples_ms=[round(value, 2) for value in metric.samples])
+                for metric in self.metrics
+            },
+        }
+        try:
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+            print(f"Instrumentation data written to {path}")
+        except IOError as e:
+            print(f"Error writing instrumentation data: {e}")
+
+_instrumentation = None
+
+def get_instrumentation():
+    """Returns the application wide Instrumentation, creating it on first use."""
+    global _instrumentation
+    if _instrumentation is None:
+        _instrumentation = Instrumentation()
+    return _instrumentation
@@ -1,3 +1,4 @@
+import copy
 import sys
 import os
 import re
@@ -7,26 +8,42 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton,
 from PyQt6.QtCore import Qt, pyqtSignal, QThreadPool, QTimer, QPointF
 from PyQt6.QtGui import QPixmap, QFont
 from functools import partial
-from scanner import scan_media
-from ui.widgets import MediaCard
-from ui.show_widgets import ShowCard, SeasonCard, PodcastCard
-from ui.episode_widgets import EpisodeWidget
+from scanner import rescan_media
+from ui.widgets import MediaCard, CardSelection
+from ui.show_widgets import ShowCard, PodcastCard
 from ui.category_widgets import ClickableCategoryCard
 from ui.main_view import MainView
 from ui.video_player import VideoPlayer
 from ui.settings_view import SettingsView
 from ui.animated_season_card import AnimatedSeasonCard
-from ui.animated_episode_card import AnimatedEpisodeCard
+from ui.episode_deck import EpisodeDeck, DECK_WINDOW
+from ui.deck_animator import get_deck_animator
 from ui.position_indicator_bar import PositionIndicatorBar
+from ui.media_grid_view import MediaGridView
+from ui.instrumentation_overlay import InstrumentationOverlay
 from tmdb import TMDbAPI
-from config import save_media_path, load_media_path
-from worker import CacheCleanupWorker, WorkerSignals, ImageDownloader, MetadataWorker
+from config import save_media_path, load_media_path, get_setting
+from worker import CacheEvictionWorker, WorkerSignals, MetadataWorker
+from cache import get_disk_cache
+from image_loader import get_image_loader, PRIORITY_NEIGHBOUR, STILL_SIZE
+from instrumentation import get_instrumentation
+
+# Milliseconds without a key press before the next incremental disk cache maintenance step
+CACHE_MAINTENANCE_IDLE_DELAY = 2000
+# Libraries with more items than this use the virtualized grid unless 'virtual_grid' is set in config.json
+VIRTUAL_GRID_THRESHOLD = 500
 
 def natural_sort_key(s):
     return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s['name'])]
 
+def use_virtual_grid(item_count):
+    setting = get_setting('virtual_grid', 'auto')
+    if setting == 'auto':
+        return item_count > VIRTUAL_GRID_THRESHOLD
+    return bool(setting)
+
 class Codex(QWidget):
-    def __init__(self):
+    def __init__(self, load_media=True):
         super().__init__()
         self.tmdb_api = TMDbAPI('df63e75244330de0737ce6f6d2f688ce')
         self.movie_cards = []
@@ -38,19 +55,42 @@ class Codex(QWidget):
         self.current_row = 0
         self.current_col = 0
         self.last_active_media_grid = None
+        self.card_selection = CardSelection()
+        self.virtual_movies = False
+        self.virtual_shows = False
         self.threadpool = QThreadPool()
-        self.pixmap_cache = {}
+        # All image loading goes through one loader, which owns the shared, size-bounded pixmap cache
+        self.image_loader = get_image_loader()
+        self.pixmap_cache = self.image_loader.pixmap_cache
         self.worker_signals = WorkerSignals()
-        self.worker_signals.download_finished.connect(self.on_image_downloaded)
-        self.worker_signals.metadata_finished.connect(self.populate_ui)
+        self.metadata_signals = None
+        # Disk cache eviction runs a small step at a time in the background, and only once
+        # the user has stopped pressing keys; every key press restarts the countdown
+        self.cache_maintenance_timer = QTimer(self)
+        self.cache_maintenance_timer.setSingleShot(True)
+        self.cache_maintenance_timer.setInterval(CACHE_MAINTENANCE_IDLE_DELAY)
+        self.cache_maintenance_timer.timeout.connect(self.maintain_disk_cache)
+        self.cache_maintenance_timer.start()
         self.initUI()
-        self.load_initial_media()
+        # Responsiveness measurements, toggled with F12
+        self.instrumentation = get_instrumentation()
+        self.instrumentation.watch_frames(self.season_view.viewport())
+        self.instrumentation.watch_frames(self.episode_view.viewport())
+        self.instrumentation.set_key_targets(lambda: (self.stack.currentWidget(),))
+        self.instrumentation_overlay = InstrumentationOverlay(self.instrumentation, self)
+        if get_setting('instrumentation', False):
+            self.toggle_instrumentation()
+        # The benchmarks create the window without a library and call populate_ui themselves
+        if load_media:
+            self.load_initial_media()
 
         # Initialize navigation map
         self.back_navigation_map = {
             self.movies_scroll_area: self.show_main_view,
             self.shows_scroll_area: self.show_main_view,
             self.podcasts_scroll_area: self.show_main_view,
+            self.movies_list_view: self.show_main_view,
+            self.shows_list_view: self.show_main_view,
             self.season_view: partial(self.show_media_grid, "shows"), # Assuming seasons always come from shows
             self.episode_view_container: partial(self.show_season_view, self.current_show_index), # Needs current_show_index
             self.settings_view: self.show_main_view
@@ -72,7 +112,7 @@ class Codex(QWidget):
         self.main_layout.addWidget(self.stack)
         
         # Category View (New Main Screen)
-        self.category_view = MainView()
+        self.category_view = MainView(self.card_selection)
         self.stack.addWidget(self.category_view)
 
         # Settings View
@@ -94,7 +134,13 @@ class Codex(QWidget):
         self.shows_scroll_area.setWidgetResizable(True)
         self.shows_scroll_area.setWidget(self.shows_grid_view)
         self.stack.addWidget(self.shows_scroll_area)
-        
+
+        # Virtualized grids, used instead of the widget grids for large libraries
+        self.movies_list_view = MediaGridView(self.pixmap_cache)
+        self.stack.addWidget(self.movies_list_view)
+        self.shows_list_view = MediaGridView(self.pixmap_cache)
+        self.stack.addWidget(self.shows_list_view)
+
         # Podcasts Grid View
         self.podcasts_grid_view = QWidget()
         self.podcasts_layout = QGridLayout()
@@ -107,7 +153,10 @@ class Codex(QWidget):
 
         # Season View
         self.season_scene = QGraphicsScene()
+        self.season_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex) # Cards move all the time
         self.season_view = QGraphicsView(self.season_scene)
+        # Repaint the view once per animation frame instead of tracking each moving card's region
+        self.season_view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
         self.season_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.season_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.stack.addWidget(self.season_view)
@@ -119,11 +168,14 @@ class Codex(QWidget):
         episode_view_layout.setSpacing(0) # Move bar closer to thumbnails
 
         self.episode_scene = QGraphicsScene()
+        self.episode_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         self.episode_view = QGraphicsView(self.episode_scene)
+        self.episode_view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
         self.episode_view.setFixedHeight(200) # Constrain the height
         self.episode_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.episode_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         episode_view_layout.addWidget(self.episode_view)
+        self.episode_deck = EpisodeDeck(self.episode_scene, get_setting('deck_window', DECK_WINDOW))
 
         # Position Indicator Bar Container
         indicator_bar_container = QWidget()
@@ -163,10 +215,24 @@ class Codex(QWidget):
         import time
         start_time = time.time()
         self.loading_label.show()
-        movies, self.shows, podcasts = scan_media(media_path)
+        movies, shows, podcasts, diff = rescan_media(media_path)
         end_time = time.time()
-        print(f"Media scan completed in {end_time - start_time:.2f} seconds.")
-        metadata_worker = MetadataWorker(movies, self.shows, podcasts, self.worker_signals)
+        print(f"Media scan completed in {end_time - start_time:.2f} seconds "
+              f"({len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['modified'])} modified).")
+
+        # Show the scanned items straight away; their metadata is filled in batch by batch.
+        self.populate_ui(movies, shows, podcasts)
+
+        # A fresh set of signals per scan, so a worker still running for a previous scan
+        # can no longer touch the cards of this one.
+        if self.metadata_signals is not None:
+            self.metadata_signals.metadata_batch.disconnect()
+            self.metadata_signals.metadata_finished.disconnect()
+        self.metadata_signals = WorkerSignals()
+        self.metadata_signals.metadata_batch.connect(self.apply_metadata_batch)
+        self.metadata_signals.metadata_finished.connect(self.on_metadata_finished)
+        # The worker gets its own copies; updates come back through the signals.
+        metadata_worker = MetadataWorker(copy.deepcopy(movies), copy.deepcopy(shows), copy.deepcopy(podcasts), self.metadata_signals)
         self.threadpool.start(metadata_worker)
 
     def populate_ui(self, movies, shows, podcasts):
@@ -178,27 +244,29 @@ class Codex(QWidget):
         self.shows = shows
         self.podcasts = podcasts
 
-        for card in self.movie_cards + self.show_cards:
+        for card in self.movie_cards + self.show_cards + self.podcast_cards:
             card.setParent(None)
         self.movie_cards, self.show_cards = [], []
         self.podcast_cards = [] # Initialize podcast cards list
-        
-        cleanup_worker = CacheCleanupWorker(self.movies, self.shows, self.worker_signals)
-        self.threadpool.start(cleanup_worker)
 
-        self.preload_images(self.movies, self.shows)
+        # Large libraries go into the virtualized grids, which only paint the visible rows
+        self.virtual_movies = use_virtual_grid(len(self.movies))
+        self.virtual_shows = use_virtual_grid(len(self.shows))
+        self.movies_list_view.set_items(self.movies if self.virtual_movies else [])
+        self.shows_list_view.set_items(self.shows if self.virtual_shows else [])
 
         row, col = 0, 0
-        for movie in self.movies:
-            card = MediaCard(movie['title'], movie['year'], movie.get('poster_path'), self.pixmap_cache)
+        for movie in ([] if self.virtual_movies else self.movies):
+            card = MediaCard(movie['title'], poster_path=movie.get('poster_path'), year=movie['year'],
+                             local_poster=movie.get('local_poster'))
             self.movies_layout.addWidget(card, row, col)
             self.movie_cards.append(card)
             col += 1
             if col > 3: col = 0; row += 1
         
         row, col = 0, 0
-        for i, show in enumerate(self.shows):
-            card = ShowCard(show, self.pixmap_cache)
+        for i, show in enumerate([] if self.virtual_shows else self.shows):
+            card = ShowCard(show)
             self.shows_layout.addWidget(card, row, col)
             self.show_cards.append(card)
             col += 1
@@ -206,7 +274,7 @@ class Codex(QWidget):
 
         row, col = 0, 0
         for i, podcast in enumerate(self.podcasts):
-            card = PodcastCard(podcast, self.pixmap_cache)
+            card = PodcastCard(podcast)
             self.podcasts_layout.addWidget(card, row + 1, col + 1)
             self.podcast_cards.append(card)
             col += 1
@@ -233,45 +301,80 @@ class Codex(QWidget):
         self.current_row = 0
         self.current_col = 0
         self.update_selection()
+        end_time = time.time()
+        print(f"UI population completed in {end_time - start_time:.2f} seconds.")
+
+    def apply_metadata_batch(self, batch):
+        """Applies a batch of metadata from MetadataWorker to the existing cards."""
+        for category, items, cards in (('movies', self.movies, self.movie_cards),
+                                       ('shows', self.shows, self.show_cards),
+                                       ('podcasts', self.podcasts, self.podcast_cards)):
+            for index, item in batch.get(category, {}).items():
+                if index < len(items):
+                    items[index] = item
+                    if index < len(cards):
+                        cards[index].set_poster_path(item.get('poster_path'))
+        for category, view in (('movies', self.movies_list_view), ('shows', self.shows_list_view)):
+            for index, item in batch.get(category, {}).items():
+                view.update_item(index, item)
+
+    def on_metadata_finished(self, movies, shows, podcasts):
+        self.movies = movies
+        self.shows = shows
+        self.podcasts = podcasts
+
+        self.preload_images(self.movies, self.shows)
+
+    def maintain_disk_cache(self):
+        self.threadpool.start(CacheEvictionWorker(), -1)
+        # The next step follows after another idle period
+        self.cache_maintenance_timer.start()
 
     def preload_images(self, movies, shows):
-        for movie in movies:
-            if movie.get('poster_path'):
-                worker = ImageDownloader(movie['poster_path'], self.worker_signals)
-                self.threadpool.start(worker)
+        # Items with local artwork never need their TMDb image. The virtualized
+        # grids load posters on demand as rows come into view. Everything here is
+        # queued behind the images of visible and focused cards.
+        paths, still_paths = [], []
+        for movie in ([] if self.virtual_movies else movies):
+            if movie.get('poster_path') and not movie.get('local_poster'):
+                paths.append(movie['poster_path'])
         for show in shows:
-            if show.get('poster_path'):
-                worker = ImageDownloader(show['poster_path'], self.worker_signals)
-                self.threadpool.start(worker)
+            if show.get('poster_path') and not show.get('local_poster') and not self.virtual_shows:
+                paths.append(show['poster_path'])
             for season in show.get('seasons', []):
-                if season.get('poster_path'):
-                    worker = ImageDownloader(season['poster_path'], self.worker_signals)
-                    self.threadpool.start(worker)
+                if season.get('poster_path') and not season.get('local_poster'):
+                    paths.append(season['poster_path'])
                 if season.get('episodes_details'):
                     for episode_data in season['episodes_details']:
-                        if episode_data.get('still_path'):
-                            worker = ImageDownloader(episode_data['still_path'], self.worker_signals)
-                            self.threadpool.start(worker)
-
-    def on_image_downloaded(self, poster_path, image_data):
-        pixmap = QPixmap()
-        pixmap.loadFromData(image_data)
-        self.pixmap_cache[poster_path] = pixmap
+                        if episode_data.get('still_path') and not episode_data.get('local_still'):
+                            still_paths.append(episode_data['still_path'])
+        dpr = self.devicePixelRatioF()
+        self.image_loader.prefetch(paths, dpr=dpr)
+        self.image_loader.prefetch(still_paths, STILL_SIZE, dpr)
+
+    def prioritize_neighbours(self, cards, index, offsets):
+        """Moves the image downloads of the cards around the focused one ahead of the prefetch."""
+        for offset in offsets:
+            if 0 <= index + offset < len(cards):
+                cards[index + offset].prioritize(PRIORITY_NEIGHBOUR)
 
     def show_media_grid(self, category_type):
         self.last_active_media_grid = category_type
         self.current_row = 0
         self.current_col = 0
         if category_type == "movies":
-            self.stack.setCurrentWidget(self.movies_scroll_area)
+            self.stack.setCurrentWidget(self.movies_list_view if self.virtual_movies else self.movies_scroll_area)
         elif category_type == "shows":
-            self.stack.setCurrentWidget(self.shows_scroll_area)
+            self.stack.setCurrentWidget(self.shows_list_view if self.virtual_shows else self.shows_scroll_area)
         elif category_type == "podcasts":
             self.stack.setCurrentWidget(self.podcasts_scroll_area)
         self.update_selection()
 
     def show_season_view(self, show_index):
         self.current_show_index = show_index
+        # Clearing the scene deletes the old cards, so none of them may still be animating
+        for card in self.season_cards:
+            get_deck_animator().cancel(card)
         self.season_scene.clear()
         self.season_cards = []
         
@@ -280,7 +383,7 @@ class Codex(QWidget):
         sorted_seasons = sorted(show['seasons'], key=natural_sort_key)
         
         for i, season in enumerate(sorted_seasons):
-            card = AnimatedSeasonCard(show.get('id'), season_data=season, pixmap_cache=self.pixmap_cache)
+            card = AnimatedSeasonCard(show.get('id'), season_data=season)
             self.season_scene.addItem(card)
             self.season_cards.append(card)
         
@@ -291,32 +394,8 @@ class Codex(QWidget):
         self.update_season_card_positions()
 
     def show_podcast_episode_view(self, podcast_index):
-        self.episode_scene.clear()
-        self.episode_cards = []
-
-        podcast = self.podcasts[podcast_index]
-        
-        for episode_data in podcast.get('episodes', []):
-            card = AnimatedEpisodeCard(episode_data, pixmap_cache=self.pixmap_cache)
-            self.episode_scene.addItem(card)
-            self.episode_cards.append(card)
-
-        self.stack.setCurrentWidget(self.episode_view_container)
-        self.current_row = 0
-        self.current_col = 0 # Ensure first card is selected
-        self.episode_view.horizontalScrollBar().setValue(0) # Reset scrollbar to left
-        QTimer.singleShot(100, self.update_episode_card_positions) # Delay positioning with 100ms
-
-    def show_podcast_episode_view(self, podcast_index):
-        self.episode_scene.clear()
-        self.episode_cards = []
-
         podcast = self.podcasts[podcast_index]
-        
-        for episode_data in podcast.get('episodes', []):
-            card = AnimatedEpisodeCard(episode_data, pixmap_cache=self.pixmap_cache)
-            self.episode_scene.addItem(card)
-            self.episode_cards.append(card)
+        self.episode_deck.set_episodes(podcast.get('episodes', []))
 
         self.stack.setCurrentWidget(self.episode_view_container)
         self.current_row = 0
@@ -325,17 +404,10 @@ class Codex(QWidget):
         QTimer.singleShot(100, self.update_episode_card_positions) # Delay positioning with 100ms
 
     def show_episode_view(self, season_index):
-        self.episode_scene.clear()
-        self.episode_cards = []
-
         show = self.shows[self.current_show_index]
         sorted_seasons = sorted(show['seasons'], key=natural_sort_key)
         season = sorted_seasons[season_index]
-        
-        for episode_data in season.get('episodes_details', []):
-            card = AnimatedEpisodeCard(episode_data, pixmap_cache=self.pixmap_cache)
-            self.episode_scene.addItem(card)
-            self.episode_cards.append(card)
+        self.episode_deck.set_episodes(season.get('episodes_details', []))
 
         self.stack.setCurrentWidget(self.episode_view_container)
         self.current_row = 0
@@ -344,12 +416,15 @@ class Codex(QWidget):
         QTimer.singleShot(100, self.update_episode_card_positions) # Delay positioning with 100ms
 
     def update_episode_card_positions(self):
-        if not self.episode_cards:
+        num_cards = len(self.episode_deck)
+        if not num_cards:
+            self.episode_position_bar.setFixedWidth(0)
+            self.episode_position_bar.set_position(0, 1)
+            self.episode_info_label.setText("No episodes found.")
             return
 
         view_width = self.episode_view.viewport().width()
-        card_width = self.episode_cards[0].boundingRect().width()
-        num_cards = len(self.episode_cards)
+        card_width = STILL_SIZE[0]
 
         # 1. Narrow the focal point's travel range to reduce lateral movement
         start_x = view_width * 0.35
@@ -360,22 +435,16 @@ class Codex(QWidget):
         else:
             focal_point_x = view_width / 2
 
-        first_card_pos_x = 0
-        last_card_pos_x = 0
+        # 2. Reduce spacing to bring cards closer
+        card_spacing = 5  # Further reduced spacing
+        card_step = card_width * 0.2 + card_spacing # Further reduced offset multiplier
 
-        for i, card in enumerate(self.episode_cards):
+        # Only the cards around the focused one exist; the rest of the deck is off screen
+        for i, card in self.episode_deck.update_window(self.current_col).items():
             distance = i - self.current_col
-
-            # 2. Reduce spacing to bring cards closer
-            card_spacing = 5  # Further reduced spacing
-            offset = distance * (card_width * 0.2 + card_spacing) # Further reduced offset multiplier
+            offset = distance * card_step
             pos_x = focal_point_x + offset - (card_width / 2)
 
-            if i == 0:
-                first_card_pos_x = pos_x
-            if i == num_cards - 1:
-                last_card_pos_x = pos_x
-
             if distance == 0:
                 scale = 1.2
                 opacity = 1.0
@@ -393,23 +462,22 @@ class Codex(QWidget):
                 else:
                     rotation = -25
 
-            card.set_properties_instantly(QPointF(pos_x, 0), scale, opacity, rotation)
-
-        # Update position bar and info label
-        if num_cards > 0:
-            last_card_width = self.episode_cards[-1].boundingRect().width() * 0.6 # 0.6 is the unfocused scale
-            total_deck_width = (last_card_pos_x + last_card_width) - first_card_pos_x
-            self.episode_position_bar.setFixedWidth(int(total_deck_width))
-            self.episode_position_bar.set_position(self.current_col, num_cards)
-            
-            current_episode_data = self.episode_cards[self.current_col].episode_card.episode_data
-            episode_number = current_episode_data.get('episode_number', 'N/A')
-            episode_name = current_episode_data.get('name', 'N/A')
-            self.episode_info_label.setText(f"Episode {episode_number}: {episode_name}")
-        else:
-            self.episode_position_bar.setFixedWidth(0)
-            self.episode_position_bar.set_position(0, 1)
-            self.episode_info_label.setText("No episodes found.")
+            card.animate_to(QPointF(pos_x, 0), scale, opacity, rotation)
+
+        for offset in (-2, -1, 1, 2):
+            card = self.episode_deck.card(self.current_col + offset)
+            if card is not None:
+                card.prioritize(PRIORITY_NEIGHBOUR)
+
+        # The position bar spans the whole deck, windowed or not, but never gets wider than the view
+        total_deck_width = (num_cards - 1) * card_step + card_width * 0.6 # 0.6 is the unfocused scale
+        self.episode_position_bar.setFixedWidth(int(min(total_deck_width, view_width)))
+        self.episode_position_bar.set_position(self.current_col, num_cards)
+
+        current_episode_data = self.episode_deck.episode(self.current_col)
+        episode_number = current_episode_data.get('episode_number', 'N/A')
+        episode_name = current_episode_data.get('name', 'N/A')
+        self.episode_info_label.setText(f"Episode {episode_number}: {episode_name}")
 
     def update_season_card_positions(self):
         if not self.season_cards:
@@ -461,7 +529,9 @@ class Codex(QWidget):
                 else:
                     rotation = -25 # Negative rotation for cards to the right
 
-            card.set_properties_instantly(QPointF(pos_x, 0), scale, opacity, rotation)
+            card.animate_to(QPointF(pos_x, 0), scale, opacity, rotation)
+
+        self.prioritize_neighbours(self.season_cards, self.current_col, (-2, -1, 1, 2))
 
     def show_settings_view(self):
         self.stack.setCurrentWidget(self.settings_view)
@@ -471,10 +541,17 @@ class Codex(QWidget):
         self.update_selection()
 
     def keyPressEvent(self, event):
+        self.cache_maintenance_timer.start()
         key = event.key()
         current_widget = self.stack.currentWidget()
 
-        if key == Qt.Key.Key_O:
+        if key == Qt.Key.Key_F12:
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.instrumentation.dump()
+            else:
+                self.toggle_instrumentation()
+            return
+        elif key == Qt.Key.Key_O:
             self.show_settings_view()
             return
         elif key == Qt.Key.Key_H:
@@ -501,10 +578,10 @@ class Codex(QWidget):
             if key == Qt.Key.Key_J:
                 self.current_col = max(self.current_col - 1, 0)
             elif key == Qt.Key.Key_K:
-                self.current_col = min(self.current_col + 1, len(self.episode_cards) - 1)
+                self.current_col = min(self.current_col + 1, len(self.episode_deck) - 1)
             elif key in (Qt.Key.Key_L, Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Space):
-                if 0 <= self.current_col < len(self.episode_cards):
-                    episode_data = self.episode_cards[self.current_col].episode_card.episode_data
+                episode_data = self.episode_deck.episode(self.current_col)
+                if episode_data is not None:
                     episode_path = episode_data.get('path')
                     if episode_path:
                         self.play_media(episode_path)
@@ -516,13 +593,25 @@ class Codex(QWidget):
         if key == Qt.Key.Key_J:
             self.current_col = max(self.current_col - 1, 0)
         elif key == Qt.Key.Key_K:
-            self.current_col = min(self.current_col + 1, 3)
+            last_col = len(self.category_view.cards) - 1 if current_widget == self.category_view else 3
+            self.current_col = min(self.current_col + 1, last_col)
         elif key == Qt.Key.Key_U:
             self.current_row = max(self.current_row - 1, 0)
         elif key == Qt.Key.Key_D:
-            self.current_row = min(self.current_row + 1, 4)
+            if isinstance(current_widget, MediaGridView):
+                self.current_row = min(self.current_row + 1, max(current_widget.row_count() - 1, 0))
+            else:
+                self.current_row = min(self.current_row + 1, 4)
         elif key in (Qt.Key.Key_L, Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Space):
-            if current_widget == self.movies_scroll_area:
+            if current_widget == self.movies_list_view:
+                index = self.current_row * 4 + self.current_col
+                if 0 <= index < len(self.movies):
+                    self.play_media(self.movies[index]['path'])
+            elif current_widget == self.shows_list_view:
+                index = self.current_row * 4 + self.current_col
+                if 0 <= index < len(self.shows):
+                    self.show_season_view(index)
+            elif current_widget == self.movies_scroll_area:
                 index = self.current_row * 4 + self.current_col
                 if 0 <= index < len(self.movie_cards):
                     self.play_media(self.movies[index]['path'])
@@ -552,6 +641,11 @@ class Codex(QWidget):
         
         self.update_selection()
 
+    def toggle_instrumentation(self):
+        enabled = not self.instrumentation.enabled
+        self.instrumentation.set_enabled(enabled)
+        self.instrumentation_overlay.setVisible(enabled)
+
     def play_media(self, path):
         print(f"Calling play_media with path: {path}")
         try:
@@ -567,37 +661,37 @@ class Codex(QWidget):
             # This logic is now handled by update_season_card_positions
             return
 
-        for card_list in [self.movie_cards, self.show_cards, self.podcast_cards, self.category_view.cards]:
-            for card in card_list:
-                if isinstance(card, ClickableCategoryCard):
-                    card.media_card.setStyleSheet("")
-                else:
-                    card.setStyleSheet("")
+        if isinstance(current_widget, MediaGridView):
+            current_widget.select(self.current_row * 4 + self.current_col)
+            return
 
         if current_widget == self.movies_scroll_area:
             cards = self.movie_cards
-            layout = self.movies_layout
         elif current_widget == self.shows_scroll_area:
             cards = self.show_cards
-            layout = self.shows_layout
         elif current_widget == self.podcasts_scroll_area:
             cards = self.podcast_cards
-            layout = self.podcasts_layout
         elif current_widget == self.category_view:
             cards = self.category_view.cards
-            layout = self.category_view.layout()
+            # Coming back from a grid the column can be past the last category
+            self.current_col = min(self.current_col, len(cards) - 1)
         else:
+            self.card_selection.clear()
             return
 
-        if not cards: return
-
-        index = self.current_row * 4 + self.current_col
-        if 0 <= index < len(cards):
-            card = cards[index]
-            if isinstance(card, ClickableCategoryCard):
-                card.media_card.setStyleSheet("border: 2px solid #0078D7;")
-            else:
-                card.setStyleSheet("border: 2px solid #0078D7;")
+        # The category deck is a single row, opened by column like the Enter key does
+        index = self.current_col if current_widget == self.category_view else self.current_row * 4 + self.current_col
+        if not 0 <= index < len(cards):
+            self.card_selection.clear()
+            return
+        # Only the previously selected card and the new one are repainted
+        self.card_selection.select(cards[index])
+        if isinstance(cards[index], ClickableCategoryCard):
+            # The category deck is laid out around the selected card
+            self.category_view.update_card_positions()
+        else:
+            # The cards one step away in each direction are the likeliest to be shown next
+            self.prioritize_neighbours(cards, index, (-4, -1, 1, 4))
 
 def main():
     app = QApplication(sys.argv)
@@ -605,6 +699,7 @@ def main():
     app.setFont(font)
     codex = Codex()
     codex.show()
+    app.aboutToQuit.connect(get_disk_cache().save)
     sys.exit(app.exec())
 
 if __name__ == '__main__':
@@ -0,0 +1,286 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+PACK_INDEX_NAME = 'index.db'
+# A new pack file is started once the current one reaches this size
+MAX_PACK_BYTES = 256 * 1024 * 1024
+# Packs with less than this share of live data are rewritten by evict() even within budget
+COMPACTION_THRESHOLD = 0.5
+
+class PackStore:
+    """
+    An alternative backend for the image disk cache that keeps blobs in a few large
+    append-only pack files instead of one file per image. Blobs are stored once per
+    distinct content (by SHA-1) and any number of cache names can point at them.
+    An SQLite index maps names to (pack, offset, length) and is loaded into memory
+    at startup, so a warm cold start opens the index and the packs and nothing else.
+
+    Reads return memoryviews into read-only mmaps of the packs, so no blob is copied.
+    A write appends the blob and only then commits its index row in a transaction,
+    so a crash or a racing writer can leave unreferenced bytes at the end of a pack
+    but never a torn entry.
+
+    The byte budget is charged with what the packs take on disk. Every pack keeps
+    counters of its live bytes and of its dead ones (blobs nothing points at any
+    more), kept up to date as blobs come and go, so evict() picks the pack to
+    compact from the counters without touching the file system.
+
+    Has the same interface as cache.DiskCache: read, write, evict and save.
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.directory, PACK_INDEX_NAME), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " digest TEXT PRIMARY KEY,"
+            " pack INTEGER NOT NULL,"
+            " offset INTEGER NOT NULL,"
+            " length INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS names ("
+            " name TEXT PRIMARY KEY,"
+            " digest TEXT NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+        # digest -> [pack, offset, length, reference count]
+        self._blobs = {digest: [pack, offset, length, 0] for digest, pack, offset, length
+                       in self._conn.execute("SELECT digest, pack, offset, length FROM blobs")}
+        # name -> [digest, last_access], least recently used first
+        self._names = OrderedDict()
+        for name, digest, last_access in self._conn.execute("SELECT name, digest, last_access FROM names ORDER BY last_access"):
+            if digest in self._blobs:
+                self._names[name] = [digest, last_access]
+                self._blobs[digest][3] += 1
+        # pack -> [live bytes, dead bytes], and pack -> digests of the blobs in it
+        self._packs = {pack: [0, size] for pack, size in self._packs_on_disk().items()}
+        self._pack_blobs = {}
+        for digest, (pack, _, length, _) in self._blobs.items():
+            counters = self._packs.setdefault(pack, [0, 0])
+            counters[0] += length
+            counters[1] = max(counters[1] - length, 0)
+            self._pack_blobs.setdefault(pack, set()).add(digest)
+        # Bytes on disk, and the part of them no blob uses
+        self.total_bytes = sum(live + dead for live, dead in self._packs.values())
+        self.dead_bytes = sum(dead for _, dead in self._packs.values())
+        self._touched = set()
+        self._maps = {} # pack -> mmap
+        self._current_pack = max(list(self._packs) + [1])
+        self._pending_removals = []
+
+    def _pack_path(self, pack):
+        return os.path.join(self.directory, f"pack-{pack:06d}.dat")
+
+    def _packs_on_disk(self):
+        """The size of every pack file, by pack number. Only read at startup."""
+        packs = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith('pack-') and entry.name.endswith('.dat') and entry.name[5:11].isdigit():
+                    packs[int(entry.name[5:11])] = entry.stat().st_size
+        return packs
+
+    def _map(self, pack, end):
+        """Returns an mmap of a pack that covers at least its first end bytes."""
+        mapped = self._maps.get(pack)
+        if mapped is None or len(mapped) < end:
+            # Blobs were appended since the pack was mapped. The old map stays
+            # valid for memoryviews still using it and is closed once they are gone.
+            with open(self._pack_path(pack), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[pack] = mapped
+        return mapped
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._names
+
+    def read(self, name):
+        """Returns a memoryview of the blob stored under a name, or None if there is none."""
+        with self._lock:
+            entry = self._names.get(name)
+            if entry is None:
+                return None
+            entry[1] = time.time()
+            self._names.move_to_end(name)
+            self._touched.add(name)
+            pack, offset, length, _ = self._blobs[entry[0]]
+            try:
+                mapped = self._map(pack, offset + length)
+            except (OSError, ValueError) as e:
+                print(f"Error reading cache pack {pack}: {e}")
+                return None
+        return memoryview(mapped)[offset:offset + length]
+
+    def write(self, name, data):
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            blob = self._blobs.get(digest)
+            try:
+                if blob is None:
+                    pack, offset = self._append(data)
+                    blob = self._blobs[digest] = [pack, offset, len(data), 0]
+                    self._pack_blobs.setdefault(pack, set()).add(digest)
+                    self._conn.execute("INSERT OR REPLACE INTO blobs (digest, pack, offset, length) VALUES (?, ?, ?, ?)",
+                                       (digest, pack, offset, len(data)))
+                previous = self._names.get(name)
+                if previous is not None and previous[0] != digest:
+                    self._release(previous[0])
+                if previous is None or previous[0] != digest:
+                    blob[3] += 1
+                self._names.pop(name, None)
+                self._names[name] = [digest, time.time()]
+                self._conn.execute("INSERT OR REPLACE INTO names (name, digest, last_access) VALUES (?, ?, ?)",
+                                   (name, digest, self._names[name][1]))
+                self._conn.commit()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error saving image to cache pack: {e}")
+
+    def _append(self, data):
+        """
+        Appends a blob to the current pack and returns its (pack, offset). The bytes are
+        counted as live in the pack. Called with the lock held.
+        """
+        size = sum(self._packs.get(self._current_pack, (0, 0)))
+        if size and size + len(data) > MAX_PACK_BYTES:
+            self._current_pack += 1
+        pack_path = self._pack_path(self._current_pack)
+        with open(pack_path, 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        counters = self._packs.setdefault(self._current_pack, [0, 0])
+        # Anything past the counted size was left behind by a crash or a failed write
+        stray = offset - counters[0] - counters[1]
+        if stray > 0:
+            counters[1] += stray
+            self.dead_bytes += stray
+            self.total_bytes += stray
+        counters[0] += len(data)
+        self.total_bytes += len(data)
+        return self._current_pack, offset
+
+    def _release(self, digest):
+        """Drops one reference to a blob, forgetting it once nothing points at it. Called with the lock held."""
+        blob = self._blobs[digest]
+        blob[3] -= 1
+        if blob[3] <= 0:
+            del self._blobs[digest]
+            self._pack_blobs[blob[0]].discard(digest)
+            counters = self._packs[blob[0]]
+            counters[0] -= blob[2]
+            counters[1] += blob[2]
+            self.dead_bytes += blob[2]
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+
+    def evict(self, max_entries=32):
+        """
+        One incremental maintenance step. While the packs take more than the budget on
+        disk, forgets up to max_entries of the least recently used names, as far as the
+        dead bytes compaction will reclaim do not already cover the excess, and rewrites
+        the pack with the most dead bytes. Within budget it only rewrites a pack whose
+        data is mostly dead. Returns the number of names evicted.
+        """
+        with self._lock:
+            over_budget = self.total_bytes > self.max_bytes
+            excess = self.total_bytes - self.max_bytes - self.dead_bytes
+            victims = []
+            if excess > 0:
+                for name, (digest, _) in self._names.items():
+                    if excess <= 0 or len(victims) >= max_entries:
+                        break
+                    victims.append(name)
+                    if self._blobs[digest][3] == 1:
+                        excess -= self._blobs[digest][2]
+                for name in victims:
+                    digest, _ = self._names.pop(name)
+                    self._touched.discard(name)
+                    self._conn.execute("DELETE FROM names WHERE name = ?", (name,))
+                    self._release(digest)
+                self._conn.commit()
+            self._compact_one(over_budget)
+            self._remove_pending()
+        return len(victims)
+
+    def _compaction_candidate(self, over_budget):
+        """
+        The pack to rewrite next, from the byte counters: over budget the one with the
+        most dead bytes, otherwise the old pack with the smallest live share below
+        COMPACTION_THRESHOLD. None if there is nothing worth rewriting.
+        """
+        candidates = [(pack, live, dead) for pack, (live, dead) in self._packs.items()
+                      if dead and pack not in self._pending_removals]
+        if over_budget:
+            return max(candidates, key=lambda candidate: candidate[2], default=(None,))[0]
+        candidates = [(live / (live + dead), pack) for pack, live, dead in candidates
+                      if pack != self._current_pack and live / (live + dead) < COMPACTION_THRESHOLD]
+        return min(candidates, default=(None, None))[1]
+
+    def _compact_one(self, over_budget):
+        """Moves the live blobs of one mostly dead pack into the current one. Called with the lock held."""
+        pack = self._compaction_candidate(over_budget)
+        if pack is None:
+            return
+        if pack == self._current_pack:
+            # The blobs can't be appended to the pack they are moved out of
+            self._current_pack += 1
+        moved = []
+        for digest in self._pack_blobs.pop(pack, set()):
+            blob = self._blobs[digest]
+            mapped = self._map(pack, blob[1] + blob[2])
+            new_pack, new_offset = self._append(mapped[blob[1]:blob[1] + blob[2]])
+            moved.append((digest, new_pack, new_offset))
+        for digest, new_pack, new_offset in moved:
+            self._blobs[digest][0], self._blobs[digest][1] = new_pack, new_offset
+            self._pack_blobs.setdefault(new_pack, set()).add(digest)
+        # Everything left in the old pack is dead until the file is removed
+        counters = self._packs[pack]
+        self.dead_bytes += counters[0]
+        counters[1] += counters[0]
+        counters[0] = 0
+        self._conn.executemany("UPDATE blobs SET pack = ?, offset = ? WHERE digest = ?",
+                               [(new_pack, new_offset, digest) for digest, new_pack, new_offset in moved])
+        self._conn.commit()
+        # Memoryviews handed out earlier may still point into the old map
+        self._maps.pop(pack, None)
+        self._pending_removals.append(pack)
+
+    def _remove_pending(self):
+        for pack in list(self._pending_removals):
+            try:
+                os.remove(self._pack_path(pack))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Still mapped somewhere on platforms that refuse to delete mapped files; retry next step
+                continue
+            self._pending_removals.remove(pack)
+            live, dead = self._packs.pop(pack, (0, 0))
+            self.total_bytes -= live + dead
+            self.dead_bytes -= dead
+
+    def save(self, access_times=True):
+        """
+        Writes the last access times of entries read since the previous save. Everything
+        else is committed as it changes, so without access_times there is nothing to do.
+        """
+        with self._lock:
+            if not access_times or not self._touched:
+                return
+            rows = [(self._names[name][1], name) for name in self._touched if name in self._names]
+            self._touched.clear()
+            try:
+                self._conn.executemany("UPDATE names SET last_access = ? WHERE name = ?", rows)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error saving cache pack index: {e}")
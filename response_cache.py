@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+RESPONSE_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.api_cache.db')
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Seconds a cached response is served without contacting TMDb, per endpoint type.
+# Searches and movie details rarely change; show and season details change as new
+# episodes air, so they are revalidated more often.
+DEFAULT_TTLS = {
+    'search': 7 * DAY,
+    'movie': 7 * DAY,
+    'show': DAY,
+    'season': DAY,
+    'other': DAY,
+}
+# Searches that found nothing are remembered for this long before trying again.
+DEFAULT_NEGATIVE_TTL = DAY
+# Expired entries are kept for revalidation and as a fallback while TMDb is unreachable,
+# but ones expired longer ago than this are deleted when the cache is opened.
+PURGE_AFTER = 30 * DAY
+
+def endpoint_type(endpoint):
+    """Classifies an API endpoint into one of the DEFAULT_TTLS keys."""
+    parts = endpoint.strip('/').split('/')
+    if parts[0] == 'search':
+        return 'search'
+    if parts[0] == 'tv':
+        return 'season' if 'season' in parts else 'show'
+    if parts[0] == 'movie':
+        return 'movie'
+    return 'other'
+
+def is_negative(endpoint, data):
+    """True for a search response that matched nothing."""
+    return endpoint_type(endpoint) == 'search' and isinstance(data, dict) and not data.get('results')
+
+class ResponseCache:
+    """
+    A persistent SQLite cache of TMDb JSON responses, keyed by endpoint and query
+    parameters. Each entry remembers the ETag / Last-Modified validators sent by the
+    server so expired entries can be revalidated with a conditional request.
+    Like MetadataCatalog, changes are only written on commit(), so a sync of thousands
+    of titles is one transaction instead of one per response.
+    """
+    def __init__(self, path=None, ttls=None, negative_ttl=None):
+        self.path = path or RESPONSE_CACHE_PATH
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.negative_ttl = DEFAULT_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " expires REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM responses WHERE expires < ?", (time.time() - PURGE_AFTER,))
+        self._conn.commit()
+
+    @staticmethod
+    def key(endpoint, params):
+        """Builds the cache key for a request. The API key is never part of it."""
+        params = sorted((k, v) for k, v in (params or {}).items() if k != 'api_key')
+        return f"/{endpoint.strip('/')}?{urlencode(params)}"
+
+    def ttl_for(self, endpoint, data):
+        if is_negative(endpoint, data):
+            return self.negative_ttl
+        return self.ttls.get(endpoint_type(endpoint), self.ttls['other'])
+
+    def get(self, key):
+        """
+        Returns a dict with 'data', 'etag', 'last_modified' and 'fresh' for a cached
+        response, or None if nothing is cached for the key.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, etag, last_modified, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            data = json.loads(row[0])
+        except ValueError:
+            return None
+        return {'data': data, 'etag': row[1], 'last_modified': row[2], 'fresh': row[3] > time.time()}
+
+    def put(self, key, data, ttl, etag=None, last_modified=None):
+        """Caches a response. Written on commit()."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, data, etag, last_modified, expires) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(data), etag, last_modified, time.time() + ttl)
+                )
+            except sqlite3.Error as e:
+                print(f"Error caching TMDb response: {e}")
+
+    def touch(self, key, ttl):
+        """Extends the lifetime of an entry the server confirmed is still current (304). Written on commit()."""
+        with self._lock:
+            try:
+                self._conn.execute("UPDATE responses SET expires = ? WHERE key = ?", (time.time() + ttl, key))
+            except sqlite3.Error as e:
+                print(f"Error caching TMDb response: {e}")
+
+    def commit(self):
+        with self._lock:
+            try:
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error saving the TMDb response cache: {e}")
@@ -1,91 +1,329 @@
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def scan_media(media_path):
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '.scan_snapshot.json')
+
+MOVIE_EXTENSIONS = ('.mp4', '.mkv', '.avi')
+EPISODE_EXTENSIONS = ('.mkv', '.mp4', '.avi')
+PODCAST_EXTENSIONS = ('.mp3', '.m4a', '.wav', '.webm')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Local artwork file names (without extension) recognised in show, season and podcast folders
+FOLDER_ARTWORK_STEMS = ('poster', 'folder', 'cover')
+
+# Filename parse rules, compiled once instead of on every file
+MOVIE_TITLE_RE = re.compile(r'^(.*) \((\d{4})\)$')
+EPISODE_NUMBER_RE = re.compile(r'.*s(\d+)e(\d+).*', re.I)
+EPISODE_NAME_RE = re.compile(r'-\s*(.*)')
+SEASON_NUMBER_RE = re.compile(r'\d+')
+# External id tags in file and directory names, e.g. "Heat (1995) {tmdb-949}", "{imdb-tt0113277}" or "[tmdbid-949]"
+ID_TAG_RE = re.compile(r'\s*[\[{]\s*(tmdb|imdb)(?:id)?[-=]\s*([^\]}\s]+)\s*[\]}]', re.I)
+# Ids inside Kodi-style .nfo files: <uniqueid type="tmdb">, <tmdbid>/<imdbid>, imdb ids anywhere, or TMDb/IMDb URLs
+NFO_TMDB_RE = re.compile(r'<uniqueid[^>]*type="tmdb"[^>]*>\s*(\d+)|<tmdbid>\s*(\d+)|themoviedb\.org/(?:movie|tv)/(\d+)', re.I)
+NFO_IMDB_RE = re.compile(r'\b(tt\d{7,})\b')
+
+# Upper bound on show/podcast directories walked concurrently
+SCAN_WORKERS = 8
+
+def _list_dir(path, previous, snapshot):
     """
-    Scans the given media path for movies, shows, and podcasts based on the expected directory structure.
+    Returns the [name, is_dir] entries of a directory.
+    If the directory's mtime matches the previous snapshot, the stored listing is
+    reused instead of listing the directory again. The listing used is recorded
+    in the new snapshot either way. Fresh listings come from os.scandir, whose
+    d_type information avoids a stat per entry.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    entry = previous.get(path)
+    if entry and entry['mtime'] == mtime and 'entries' in entry:
+        listing = entry['entries']
+    else:
+        try:
+            with os.scandir(path) as it:
+                listing = [[dir_entry.name, dir_entry.is_dir()] for dir_entry in it]
+        except OSError:
+            listing = []
+    snapshot[path] = {'mtime': mtime, 'entries': listing}
+    return listing
+
+def _extract_id_tags(name):
+    """Returns the name with any {tmdb-...}/{imdb-...} tags removed, and the ids they carried."""
+    ids = {}
+    for source, value in ID_TAG_RE.findall(name):
+        source = source.lower()
+        if source == 'tmdb' and value.isdigit():
+            ids['tmdb_id'] = int(value)
+        elif source == 'imdb':
+            ids['imdb_id'] = value
+    return ID_TAG_RE.sub('', name).strip(), ids
+
+def _read_nfo_ids(nfo_path, previous, snapshot):
+    """
+    Extracts TMDb and IMDb ids from a Kodi-style .nfo file (XML or a bare URL).
+    Like directory listings, the ids are recorded in the snapshot against the file's
+    mtime and reused from the previous snapshot while the mtime is unchanged.
     """
+    try:
+        mtime = os.stat(nfo_path).st_mtime_ns
+    except OSError:
+        return {}
+    entry = previous.get(nfo_path)
+    if entry and entry['mtime'] == mtime and 'ids' in entry:
+        ids = entry['ids']
+    else:
+        ids = _parse_nfo_ids(nfo_path)
+    snapshot[nfo_path] = {'mtime': mtime, 'ids': ids}
+    return dict(ids)
+
+def _parse_nfo_ids(nfo_path):
+    try:
+        with open(nfo_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read(64 * 1024)
+    except OSError:
+        return {}
+    ids = {}
+    tmdb_match = NFO_TMDB_RE.search(content)
+    if tmdb_match:
+        ids['tmdb_id'] = int(next(group for group in tmdb_match.groups() if group))
+    imdb_match = NFO_IMDB_RE.search(content)
+    if imdb_match:
+        ids['imdb_id'] = imdb_match.group(1)
+    return ids
+
+def _attach_ids(data, name_ids, nfo_path, previous, snapshot):
+    """
+    Records external ids on a scanned item. The ids come from one source only: the
+    name's id tags if it has any, otherwise the .nfo file. Ids from the two are never
+    mixed, so a stale .nfo cannot pair its id with a different title's tag.
+    """
+    if name_ids:
+        ids = name_ids
+    elif nfo_path:
+        ids = _read_nfo_ids(nfo_path, previous, snapshot)
+    else:
+        ids = {}
+    data.update(ids)
+    return data
+
+def _image_files(listing):
+    """Maps the lowercased stem of every image file in a directory listing to its file name."""
+    return {os.path.splitext(name)[0].lower(): name for name, is_dir in listing
+            if not is_dir and name.lower().endswith(IMAGE_EXTENSIONS)}
+
+def _find_artwork(directory, images, stems):
+    """Returns the path of the first local artwork file matching one of the candidate stems, or None."""
+    for stem in stems:
+        name = images.get(stem.lower())
+        if name:
+            return os.path.join(directory, name)
+    return None
+
+def _parse_movie(movies_path, item, nfo_names, images, previous, snapshot):
+    base_name = os.path.splitext(item)[0]
+    filename, name_ids = _extract_id_tags(base_name)
+
+    match = MOVIE_TITLE_RE.match(filename)
+    if match:
+        title = match.group(1).replace('.', ' ').strip()
+        year = int(match.group(2))
+    else:
+        title = filename.replace('.', ' ').strip()
+        year = None
+
+    # The .nfo sidecar and artwork of a movie file share its base name
+    nfo_name = base_name + '.nfo'
+    nfo_path = os.path.join(movies_path, nfo_name) if nfo_name in nfo_names else None
+    return _attach_ids({
+        'title': title,
+        'year': year,
+        'path': os.path.join(movies_path, item),
+        'local_poster': _find_artwork(movies_path, images, (f'{base_name}-poster', base_name))
+    }, name_ids, nfo_path, previous, snapshot)
+
+def _parse_episode(season_path, episode_file, images=None):
+    episode_name = os.path.splitext(episode_file)[0]
+
+    # Attempt to parse episode number and name from filename
+    match = EPISODE_NUMBER_RE.match(episode_name)
+    if match:
+        episode_number = int(match.group(2))
+        # Try to extract a clean name, otherwise fall back
+        name_match = EPISODE_NAME_RE.search(episode_name)
+        if name_match:
+            name = name_match.group(1)
+        else:
+            name = episode_name
+    else:
+        episode_number = None
+        name = episode_name
+
+    return {
+        'episode_number': episode_number,
+        'name': name,
+        'path': os.path.join(season_path, episode_file),
+        'local_still': _find_artwork(season_path, images or {}, (f'{episode_name}-thumb', episode_name))
+    }
+
+def _season_poster_stems(season_dir):
+    """Kodi-style season artwork names kept in the show folder, e.g. season01-poster.jpg."""
+    season_number_match = SEASON_NUMBER_RE.search(season_dir)
+    if not season_number_match:
+        return ()
+    season_number = int(season_number_match.group())
+    if season_number == 0:
+        return ('season-specials-poster', 'season00-poster')
+    return (f'season{season_number:02d}-poster', f'season{season_number}-poster')
+
+def _scan_show(show_path, show_dir, previous, snapshot):
+    seasons = []
+    listing = _list_dir(show_path, previous, snapshot)
+    show_images = _image_files(listing)
+    for season_dir, season_is_dir in listing:
+        if season_is_dir and season_dir.lower().startswith('season'):
+            season_path = os.path.join(show_path, season_dir)
+            season_listing = _list_dir(season_path, previous, snapshot)
+            season_images = _image_files(season_listing)
+            episodes = [_parse_episode(season_path, episode_file, season_images)
+                        for episode_file, _ in season_listing
+                        if episode_file.lower().endswith(EPISODE_EXTENSIONS)]
+            local_poster = (_find_artwork(show_path, show_images, _season_poster_stems(season_dir))
+                            or _find_artwork(season_path, season_images, FOLDER_ARTWORK_STEMS))
+            seasons.append({'name': season_dir, 'path': season_path, 'episodes': episodes, 'local_poster': local_poster})
+    if seasons:
+        title, name_ids = _extract_id_tags(show_dir)
+        has_nfo = any(name == 'tvshow.nfo' and not is_dir for name, is_dir in listing)
+        nfo_path = os.path.join(show_path, 'tvshow.nfo') if has_nfo else None
+        return _attach_ids({
+            'title': title,
+            'path': show_path,
+            'seasons': seasons,
+            'local_poster': _find_artwork(show_path, show_images, FOLDER_ARTWORK_STEMS)
+        }, name_ids, nfo_path, previous, snapshot)
+    return None
+
+def _scan_podcast(podcast_series_path, podcast_series_dir, previous, snapshot):
+    listing = _list_dir(podcast_series_path, previous, snapshot)
+    images = _image_files(listing)
+    podcast_episodes = [{
+        'name': os.path.splitext(episode_file)[0],
+        'path': os.path.join(podcast_series_path, episode_file),
+        'local_still': _find_artwork(podcast_series_path, images, (os.path.splitext(episode_file)[0],))
+    } for episode_file, _ in listing
+        if episode_file.lower().endswith(PODCAST_EXTENSIONS)]
+    if podcast_episodes:
+        return {
+            'title': podcast_series_dir,
+            'path': podcast_series_path,
+            'episodes': podcast_episodes,
+            'local_poster': _find_artwork(podcast_series_path, images, FOLDER_ARTWORK_STEMS)
+        }
+    return None
+
+def iter_media(media_path, previous=None, snapshot=None, ordered=False):
+    """
+    Walks the media path and yields (kind, item) pairs, where kind is 'movie', 'show'
+    or 'podcast', as soon as each item has been scanned. Show and podcast directories
+    are walked concurrently on a bounded thread pool. By default items are yielded in
+    completion order; with ordered=True they follow the directory listing order.
+    """
+    previous = previous if previous is not None else {}
+    snapshot = snapshot if snapshot is not None else {}
     movies_path = os.path.join(media_path, 'movies')
     shows_path = os.path.join(media_path, 'shows')
     podcasts_path = os.path.join(media_path, 'podcasts')
 
-    movies = []
-    if os.path.exists(movies_path):
-        for item in os.listdir(movies_path):
-            item_path = os.path.join(movies_path, item)
-            if os.path.isfile(item_path) and item.lower().endswith(('.mp4', '.mkv', '.avi')):
-                filename = os.path.splitext(item)[0]
-                
-                match = re.match(r'^(.*) \((\d{4})\)$', filename)
-                if match:
-                    title = match.group(1).replace('.', ' ').strip()
-                    year = int(match.group(2))
-                else:
-                    title = filename.replace('.', ' ').strip()
-                    year = None
-
-                movie_data = {
-                    'title': title,
-                    'year': year,
-                    'path': item_path
-                }
-                movies.append(movie_data)
-
-    shows = []
-    if os.path.exists(shows_path):
-        for show_dir in os.listdir(shows_path):
-            show_path = os.path.join(shows_path, show_dir)
-            if os.path.isdir(show_path):
-                seasons = []
-                for season_dir in os.listdir(show_path):
-                    if os.path.isdir(os.path.join(show_path, season_dir)) and season_dir.lower().startswith('season'):
-                        episodes = []
-                        season_path = os.path.join(show_path, season_dir)
-                        for episode_file in os.listdir(season_path):
-                            if episode_file.lower().endswith(('.mkv', '.mp4', '.avi')):
-                                episode_path = os.path.join(season_path, episode_file)
-                                episode_name = os.path.splitext(episode_file)[0]
-                                
-                                # Attempt to parse episode number and name from filename
-                                match = re.match(r'.*s(\d+)e(\d+).*', episode_name, re.I)
-                                if match:
-                                    episode_number = int(match.group(2))
-                                    # Try to extract a clean name, otherwise fall back
-                                    name_match = re.search(r'-\s*(.*)', episode_name)
-                                    if name_match:
-                                        name = name_match.group(1)
-                                    else:
-                                        name = episode_name
-                                else:
-                                    episode_number = None
-                                    name = episode_name
-
-                                episodes.append({
-                                    'episode_number': episode_number,
-                                    'name': name,
-                                    'path': episode_path
-                                })
-                        seasons.append({'name': season_dir, 'episodes': episodes})
-                if seasons:
-                    show_data = {'title': show_dir, 'path': show_path, 'seasons': seasons}
-                    shows.append(show_data)
-
-    podcasts = []
-    if os.path.exists(podcasts_path):
-        for podcast_series_dir in os.listdir(podcasts_path):
-            podcast_series_path = os.path.join(podcasts_path, podcast_series_dir)
-            if os.path.isdir(podcast_series_path):
-                podcast_episodes = []
-                for episode_file in os.listdir(podcast_series_path):
-                    if episode_file.lower().endswith(('.mp3', '.m4a', '.wav', '.webm')):
-                        episode_path = os.path.join(podcast_series_path, episode_file)
-                        episode_name = os.path.splitext(episode_file)[0]
-                        podcast_episodes.append({
-                            'name': episode_name,
-                            'path': episode_path
-                        })
-                if podcast_episodes:
-                    podcast_data = {'title': podcast_series_dir, 'path': podcast_series_path, 'episodes': podcast_episodes}
-                    podcasts.append(podcast_data)
-
-    return movies, shows, podcasts
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        futures = []
+        for show_dir, is_dir in _list_dir(shows_path, previous, snapshot):
+            if is_dir:
+                future = executor.submit(_scan_show, os.path.join(shows_path, show_dir), show_dir, previous, snapshot)
+                futures.append(('show', future))
+        for podcast_series_dir, is_dir in _list_dir(podcasts_path, previous, snapshot):
+            if is_dir:
+                future = executor.submit(_scan_podcast, os.path.join(podcasts_path, podcast_series_dir), podcast_series_dir, previous, snapshot)
+                futures.append(('podcast', future))
+
+        # Movies live in a single flat directory, so list them while the pool works.
+        movie_listing = _list_dir(movies_path, previous, snapshot)
+        nfo_names = {item for item, is_dir in movie_listing if not is_dir and item.lower().endswith('.nfo')}
+        movie_images = _image_files(movie_listing)
+        for item, is_dir in movie_listing:
+            if not is_dir and item.lower().endswith(MOVIE_EXTENSIONS):
+                yield 'movie', _parse_movie(movies_path, item, nfo_names, movie_images, previous, snapshot)
+
+        if ordered:
+            completed = (future for _, future in futures)
+        else:
+            completed = as_completed([future for _, future in futures])
+        kinds = {future: kind for kind, future in futures}
+        for future in completed:
+            item = future.result()
+            if item is not None:
+                yield kinds[future], item
+
+def _scan(media_path, previous, snapshot):
+    media = {'movie': [], 'show': [], 'podcast': []}
+    for kind, item in iter_media(media_path, previous, snapshot, ordered=True):
+        media[kind].append(item)
+    return media['movie'], media['show'], media['podcast']
+
+def scan_media(media_path):
+    """
+    Scans the given media path for movies, shows, and podcasts based on the expected directory structure.
+    """
+    return _scan(media_path, {}, {})
+
+def _item_fingerprints(movies, shows, podcasts):
+    """Maps each top-level item path to a fingerprint of the files it contains."""
+    items = {movie['path']: None for movie in movies}
+    for show in shows:
+        items[show['path']] = sorted(episode['path'] for season in show['seasons'] for episode in season['episodes'])
+    for podcast in podcasts:
+        items[podcast['path']] = sorted(episode['path'] for episode in podcast['episodes'])
+    return items
+
+def load_snapshot(snapshot_path=None):
+    try:
+        with open(snapshot_path or SNAPSHOT_PATH, 'r') as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+def save_snapshot(snapshot, snapshot_path=None):
+    try:
+        with open(snapshot_path or SNAPSHOT_PATH, 'w') as f:
+            json.dump(snapshot, f)
+    except IOError as e:
+        print(f"Error saving scan snapshot: {e}")
+
+def rescan_media(media_path, snapshot_path=None):
+    """
+    Incrementally rescans the media path against the snapshot persisted by the previous scan.
+    Only directories whose mtime changed are listed again, and only .nfo files whose mtime
+    changed are read again. Returns (movies, shows, podcasts, diff),
+    where diff maps 'added', 'removed' and 'modified' to lists of movie, show and podcast paths.
+    A show or podcast is 'modified' when its set of episode files changed; changes to the contents
+    of an existing file do not touch directory mtimes and are left to the metadata catalog.
+    """
+    previous = load_snapshot(snapshot_path)
+    if previous.get('media_path') != media_path:
+        previous = {}
+    # Directory listings and .nfo ids, keyed by path and checked against the path's mtime
+    paths = {}
+    movies, shows, podcasts = _scan(media_path, previous.get('paths', {}), paths)
+
+    old_items = previous.get('items', {})
+    new_items = _item_fingerprints(movies, shows, podcasts)
+    diff = {
+        'added': sorted(path for path in new_items if path not in old_items),
+        'removed': sorted(path for path in old_items if path not in new_items),
+        'modified': sorted(path for path in new_items if path in old_items and new_items[path] != old_items[path])
+    }
+
+    save_snapshot({'media_path': media_path, 'paths': paths, 'items': new_items}, snapshot_path)
+    return movies, shows, podcasts, diff
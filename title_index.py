@@ -0,0 +1,133 @@
+import gzip
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+
+TITLE_INDEX_PATH = os.path.join(os.path.dirname(__file__), '.title_index.db')
+
+# Daily export files are named e.g. movie_ids_05_15_2024.json.gz / tv_series_ids_05_15_2024.json.gz
+EXPORT_KINDS = {'movie_ids': 'movie', 'tv_series_ids': 'tv'}
+TITLE_FIELDS = {'movie': 'original_title', 'tv': 'original_name'}
+
+TRAILING_YEAR_RE = re.compile(r'\s*\((\d{4})\)$')
+NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+
+def normalize_title(title):
+    """
+    Reduces a title to the form used as the index key: a trailing "(YYYY)" is dropped,
+    accents are stripped, and the rest is lowercased with punctuation collapsed to spaces.
+    """
+    title = TRAILING_YEAR_RE.sub('', title)
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(c for c in title if not unicodedata.combining(c))
+    return NON_ALNUM_RE.sub(' ', title.lower()).strip()
+
+def title_year(title):
+    """The year of a trailing "(YYYY)" in title, or None."""
+    match = TRAILING_YEAR_RE.search(title)
+    return int(match.group(1)) if match else None
+
+class TitleIndex:
+    """
+    A compact local index from normalized title to TMDb id, built from the TMDb daily
+    ID export files. Titles shared by more than one id are kept as ambiguous so that
+    MetadataWorker falls back to a network search for them.
+
+    The export files only carry the original title and no release year, so matches
+    are by title alone and only unambiguous titles resolve. A file named in English
+    can still hit an unrelated title whose original title happens to match, so
+    MetadataWorker checks the release year of the details it fetches for a match
+    against the year in the file name and searches instead when they differ.
+    """
+    def __init__(self, path=None):
+        self.path = path or TITLE_INDEX_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # tmdb_id is NULL for ambiguous titles
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS titles ("
+            " kind TEXT NOT NULL,"
+            " title TEXT NOT NULL,"
+            " tmdb_id INTEGER,"
+            " PRIMARY KEY (kind, title)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def exists(path=None):
+        return os.path.exists(path or TITLE_INDEX_PATH)
+
+    def lookup(self, kind, title):
+        """Returns the TMDb id for a 'movie' or 'tv' title, or None if it is unknown or ambiguous."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tmdb_id FROM titles WHERE kind = ? AND title = ?", (kind, normalize_title(title))
+            ).fetchone()
+        return row[0] if row else None
+
+    def import_export(self, export_path, kind=None):
+        """
+        Replaces the index entries of one kind with the contents of a gzipped JSON-lines
+        export file. The kind is taken from the file name unless given. Returns the
+        number of (unambiguous, ambiguous) titles indexed.
+        """
+        if kind is None:
+            prefix = next((p for p in EXPORT_KINDS if os.path.basename(export_path).startswith(p)), None)
+            if prefix is None:
+                raise ValueError(f"Cannot tell the media type of {export_path}, expected a movie_ids or tv_series_ids export")
+            kind = EXPORT_KINDS[prefix]
+        title_field = TITLE_FIELDS[kind]
+
+        with self._lock:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS staging (title TEXT, tmdb_id INTEGER)")
+            self._conn.execute("DELETE FROM staging")
+            with gzip.open(export_path, 'rt', encoding='utf-8') as f:
+                batch = []
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    title = normalize_title(record.get(title_field) or '')
+                    if title and record.get('id') is not None:
+                        batch.append((title, record['id']))
+                    if len(batch) >= 10000:
+                        self._conn.executemany("INSERT INTO staging VALUES (?, ?)", batch)
+                        batch = []
+                self._conn.executemany("INSERT INTO staging VALUES (?, ?)", batch)
+
+            self._conn.execute("DELETE FROM titles WHERE kind = ?", (kind,))
+            self._conn.execute(
+                "INSERT INTO titles (kind, title, tmdb_id) "
+                "SELECT ?, title, CASE WHEN COUNT(DISTINCT tmdb_id) = 1 THEN MIN(tmdb_id) END "
+                "FROM staging GROUP BY title",
+                (kind,)
+            )
+            self._conn.execute("DELETE FROM staging")
+            self._conn.commit()
+            unique, ambiguous = self._conn.execute(
+                "SELECT COUNT(tmdb_id), COUNT(*) - COUNT(tmdb_id) FROM titles WHERE kind = ?", (kind,)
+            ).fetchone()
+            self._conn.execute("VACUUM")
+        return unique, ambiguous
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == '__main__':
+    # Import one or more TMDb daily ID export files, e.g.
+    # python title_index.py movie_ids_05_15_2024.json.gz tv_series_ids_05_15_2024.json.gz
+    if len(sys.argv) < 2:
+        print("Usage: python title_index.py <export.json.gz> [<export.json.gz> ...]")
+        sys.exit(1)
+    index = TitleIndex()
+    for export_path in sys.argv[1:]:
+        unique, ambiguous = index.import_export(export_path)
+        print(f"Imported {export_path}: {unique} titles indexed, {ambiguous} ambiguous.")
+    index.close()
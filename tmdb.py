@@ -1,27 +1,117 @@
+import datetime
 import requests
 import os
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import get_setting
+from response_cache import ResponseCache
+
+# Seconds to wait for a connection / response before giving up on a request
+REQUEST_TIMEOUT = (5, 30)
+# TMDb accepts at most this many append_to_response entries per request
+MAX_APPENDED_RESPONSES = 20
+# The /changes endpoints accept date ranges of at most this many days per query
+CHANGES_WINDOW_DAYS = 14
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class SessionPool:
+    """
+    Hands out one requests.Session per thread. All sessions mount the same HTTPAdapter,
+    so keep-alive connections are pooled across threads (pool_size connections per host)
+    while per-session state is never shared between threads. Transient failures are
+    retried with exponential backoff.
+    """
+    def __init__(self, pool_size=8, retries=3, backoff_factor=0.5):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False # Hand the last response back so callers can log it
+        )
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self._local = threading.local()
+
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        return self.session().get(url, **kwargs)
 
 class TMDbAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url=None, pool_size=8, response_cache=None):
         self.api_key = api_key
-        self.base_url = 'https://api.themoviedb.org/3'
+        # base_url can point at a local stand-in server for testing and benchmarking
+        self.base_url = (base_url or 'https://api.themoviedb.org/3').rstrip('/')
+        self.sessions = SessionPool(pool_size=pool_size)
+        if response_cache is None:
+            response_cache = ResponseCache(ttls=get_setting('api_cache_ttls'),
+                                           negative_ttl=get_setting('api_negative_ttl'))
+        # Pass response_cache=False to always go to the network
+        self.response_cache = response_cache or None
 
-    def _get(self, endpoint, params=None):
+    def _get(self, endpoint, params=None, refresh=False, cache=True):
+        """
+        Fetches a JSON response. refresh=True revalidates a cached response even if it has not
+        expired yet; cache=False bypasses the response cache entirely. When TMDb fails, the
+        stale cached copy is served instead, except for a refresh: that returns None, so the
+        caller knows the refresh did not happen.
+        """
         if params is None:
             params = {}
-        
+
+        cached = None
+        use_cache = cache and self.response_cache
+        if use_cache:
+            cache_key = self.response_cache.key(endpoint, params)
+            cached = self.response_cache.get(cache_key)
+            if cached and cached['fresh'] and not refresh:
+                return cached['data']
+
         params['api_key'] = self.api_key
+        headers = {}
+        if cached:
+            # Revalidate the expired entry instead of downloading it again
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
 
         try:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = requests.get(url, params=params)
+            response = self.sessions.get(url, params=params, headers=headers)
+            if response.status_code == 304 and cached:
+                self.response_cache.touch(cache_key, self.response_cache.ttl_for(endpoint, cached['data']))
+                return cached['data']
             if response.status_code != 200:
                 print(f"Error from TMDb API: {response.status_code} - {response.text}")
-                return None
-            return response.json()
-        except requests.exceptions.RequestException as e:
+                return cached['data'] if cached and not refresh else None
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Error fetching data from TMDb: {e}")
-            return None
+            # Serve the stale copy rather than nothing when TMDb is unreachable
+            return cached['data'] if cached and not refresh else None
+
+        if use_cache:
+            self.response_cache.put(cache_key, data, self.response_cache.ttl_for(endpoint, data),
+                                    etag=response.headers.get('ETag'),
+                                    last_modified=response.headers.get('Last-Modified'))
+        return data
+
+    def commit(self):
+        """Writes the responses cached since the last commit."""
+        if self.response_cache:
+            self.response_cache.commit()
 
     def search_movie(self, title, year=None):
         """Search for a movie by title and optionally year."""
@@ -30,15 +120,19 @@ class TMDbAPI:
             params['year'] = year
         return self._get('/search/movie', params)
 
-    def get_movie_details(self, movie_id):
+    def get_movie_details(self, movie_id, refresh=False):
         """Get details for a specific movie."""
-        return self._get(f'/movie/{movie_id}')
+        return self._get(f'/movie/{movie_id}', refresh=refresh)
 
     def search_show(self, title):
         """Search for a show by title."""
         params = {'query': title}
         return self._get('/search/tv', params)
 
+    def find_by_imdb_id(self, imdb_id):
+        """Find movies and shows by their IMDb id. Results are in 'movie_results' and 'tv_results'."""
+        return self._get(f'/find/{imdb_id}', {'external_source': 'imdb_id'})
+
     def get_show_details(self, show_id):
         """Get details for a specific show."""
         return self._get(f'/tv/{show_id}')
@@ -47,6 +141,54 @@ class TMDbAPI:
         """Get details for a specific season of a show."""
         return self._get(f'/tv/{show_id}/season/{season_number}')
 
+    def get_show_with_seasons(self, show_id, season_numbers, refresh=False):
+        """
+        Get details for a show together with several of its seasons, using append_to_response
+        so up to MAX_APPENDED_RESPONSES seasons come back in a single request.
+        Returns (show_details, {season_number: season_details}).
+        """
+        season_numbers = sorted(set(season_numbers))
+        chunks = [season_numbers[i:i + MAX_APPENDED_RESPONSES]
+                  for i in range(0, len(season_numbers), MAX_APPENDED_RESPONSES)] or [[]]
+        show_details = None
+        seasons = {}
+        for chunk in chunks:
+            params = {'append_to_response': ','.join(f'season/{n}' for n in chunk)} if chunk else None
+            details = self._get(f'/tv/{show_id}', params, refresh=refresh)
+            if not details:
+                continue
+            for season_number in chunk:
+                season_details = details.pop(f'season/{season_number}', None)
+                if season_details:
+                    seasons[season_number] = season_details
+            if show_details is None:
+                show_details = details
+        return show_details, seasons
+
+    def get_changed_ids(self, media_type, since, until=None):
+        """
+        Get the ids of every movie ('movie') or show ('tv') whose TMDb data changed between
+        the since and until dates (until defaults to today), walking the /changes feed in
+        windows of CHANGES_WINDOW_DAYS and through all result pages.
+        Returns None if the feed could not be read completely.
+        """
+        until = until or datetime.date.today()
+        changed_ids = set()
+        window_start = since
+        while window_start <= until:
+            window_end = min(window_start + datetime.timedelta(days=CHANGES_WINDOW_DAYS - 1), until)
+            page, total_pages = 1, 1
+            while page <= total_pages:
+                params = {'start_date': window_start.isoformat(), 'end_date': window_end.isoformat(), 'page': page}
+                changes = self._get(f'/{media_type}/changes', params, cache=False)
+                if changes is None:
+                    return None
+                changed_ids.update(result['id'] for result in changes.get('results', []) if 'id' in result)
+                total_pages = changes.get('total_pages') or 1
+                page += 1
+            window_start = window_end + datetime.timedelta(days=1)
+        return changed_ids
+
 
 if __name__ == '__main__':
     # This is for testing the TMDb API wrapper directly.
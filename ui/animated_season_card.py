@@ -1,60 +1,31 @@
-from PyQt6.QtWidgets import QGraphicsProxyWidget
-from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, QPointF, pyqtProperty
-from PyQt6.QtGui import QTransform
-from PyQt6.QtCore import Qt
-
-from ui.show_widgets import SeasonCard
-
-class AnimatedSeasonCard(QGraphicsProxyWidget):
-    def __init__(self, show_id, season_data, pixmap_cache):
-        super().__init__()
-        self.season_card = SeasonCard(show_id, season_data, pixmap_cache)
-        self.setWidget(self.season_card)
-        self.setTransformOriginPoint(self.boundingRect().center())
-        self._rotation_y = 0
-
-        self.pos_animation = QPropertyAnimation(self, b"pos")
-        self.pos_animation.setDuration(300)
-        self.pos_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-
-        self.scale_animation = QPropertyAnimation(self, b"scale")
-        self.scale_animation.setDuration(300)
-        self.scale_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-
-        self.opacity_animation = QPropertyAnimation(self, b"opacity")
-        self.opacity_animation.setDuration(300)
-        self.opacity_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-
-        self.rotation_animation = QPropertyAnimation(self, b"rotationY")
-        self.rotation_animation.setDuration(300)
-        self.rotation_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-
-    @pyqtProperty(float)
-    def rotationY(self):
-        return self._rotation_y
-
-    @rotationY.setter
-    def rotationY(self, angle):
-        self._rotation_y = angle
-        transform = QTransform()
-        transform.rotate(self._rotation_y, Qt.Axis.YAxis)
-        self.setTransform(transform)
-
-    def animate_to(self, pos, scale, opacity, rotation):
-        # This method is kept for potential future use, but we'll use instant set for now
-        pass
-
-    def set_properties_instantly(self, pos, scale, opacity, rotation):
-        self.setPos(pos)
-        self.setScale(scale)
-        self.setOpacity(opacity)
-        self.rotationY = rotation # Use the property setter
-
-    def set_selected(self, selected):
-        if selected:
-            self.setZValue(1)
-            self.season_card.setStyleSheet("border: 2px solid #0078D7;")
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QColor
+
+from image_loader import POSTER_SIZE
+from ui.deck_card import DeckCard
+
+class AnimatedSeasonCard(DeckCard):
+    """
+    A season in the season deck: poster with the season name below it.
+    """
+    def __init__(self, show_id, season_data):
+        super().__init__(200, 350, POSTER_SIZE)
+        self.show_id = show_id
+        self.season_data = season_data
+        # Artwork found next to the media wins over TMDb and needs no download
+        self.load_image([(season_data.get('local_poster'), True), (season_data.get('poster_path'), False)])
+
+    def paint_card(self, painter):
+        rect = self.boundingRect()
+        poster_rect = QRectF(0, 5, POSTER_SIZE[0], POSTER_SIZE[1])
+        self.draw_image(painter, poster_rect)
+
+        painter.setPen(QColor("white"))
+        text_rect = QRectF(5, poster_rect.bottom() + 5, rect.width() - 10, rect.height() - poster_rect.bottom() - 10)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                         self.season_data.get('name', ''))
+
+        if self.selected:
+            self.draw_border(painter, rect, "#0078D7", 2)
         else:
-            self.setZValue(0)
-            self.season_card.setStyleSheet("border: 1px solid #555;")
-
+            self.draw_border(painter, rect, "#555", 1)
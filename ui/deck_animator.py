@@ -0,0 +1,97 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, QPointF, Qt
+from config import get_setting
+
+# Milliseconds between animation frames, about 60 per second
+FRAME_INTERVAL = 16
+# Seconds a card takes to move to a new place in the deck
+DEFAULT_DURATION = 0.18
+# A frame arriving later than this (two frames) means the GUI thread cannot keep
+# up; running animations then jump to their targets instead of stuttering there
+FRAME_BUDGET = 0.034
+
+class DeckAnimator(QObject):
+    """
+    Drives the position, scale, opacity and Y rotation of every moving deck card
+    from one frame timer. Each tick advances all running animations together, so
+    the scene repaints once per frame however many cards move. Retargeting a card
+    mid-flight starts its new animation from where it currently is, which keeps
+    rapid key navigation smooth.
+    """
+    def __init__(self, duration=DEFAULT_DURATION, parent=None):
+        super().__init__(parent)
+        self.duration = duration
+        # card -> (start state, target state, start time); a state is (x, y, scale, opacity, rotation)
+        self.animations = {}
+        self.last_frame = 0
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self.tick)
+
+    def animate(self, card, pos, scale, opacity, rotation):
+        target = (pos.x(), pos.y(), scale, opacity, rotation)
+        if self.duration <= 0:
+            self.cancel(card)
+            self.apply(card, target)
+            return
+        start = (card.pos().x(), card.pos().y(), card.scale(), card.opacity(), card.rotationY)
+        if start == target:
+            self.animations.pop(card, None)
+            return
+        running = self.animations.get(card)
+        if running is not None and running[1] == target:
+            return
+        now = time.perf_counter()
+        self.animations[card] = (start, target, now)
+        if not self.timer.isActive():
+            self.last_frame = now
+            self.timer.start()
+
+    def cancel(self, card):
+        """Stops animating a card, leaving it where it is."""
+        self.animations.pop(card, None)
+
+    def finish(self):
+        """Moves every animating card straight to its target."""
+        animations, self.animations = self.animations, {}
+        self.timer.stop()
+        for card, (_, target, _) in animations.items():
+            self.apply(card, target)
+
+    def tick(self):
+        now = time.perf_counter()
+        late = now - self.last_frame > FRAME_BUDGET
+        self.last_frame = now
+        if late:
+            self.finish()
+            return
+        for card, (start, target, started) in list(self.animations.items()):
+            progress = min((now - started) / self.duration, 1.0)
+            eased = 1 - (1 - progress) ** 3 # Ease out: fast start, gentle landing
+            self.apply(card, tuple(a + (b - a) * eased for a, b in zip(start, target)))
+            if progress >= 1.0:
+                # apply() already dropped the animation if the card was deleted
+                self.animations.pop(card, None)
+        if not self.animations:
+            self.timer.stop()
+
+    def apply(self, card, state):
+        x, y, scale, opacity, rotation = state
+        try:
+            card.setPos(QPointF(x, y))
+            card.setScale(scale)
+            card.setOpacity(opacity)
+            card.rotationY = rotation
+        except RuntimeError:
+            # The card was deleted by Qt, e.g. when its scene was cleared
+            self.animations.pop(card, None)
+
+_deck_animator = None
+
+def get_deck_animator():
+    """Returns the animator shared by all decks, creating it on first use."""
+    global _deck_animator
+    if _deck_animator is None:
+        _deck_animator = DeckAnimator(get_setting('deck_animation_ms', DEFAULT_DURATION * 1000) / 1000)
+    return _deck_animator
@@ -0,0 +1,128 @@
+import math
+from PyQt6.QtWidgets import QGraphicsObject, QGraphicsItem
+from PyQt6.QtGui import QTransform, QPainter, QPen, QColor, QGuiApplication
+from PyQt6.QtCore import Qt, QRectF, QSize, pyqtProperty
+from image_loader import get_image_loader, PRIORITY_PREFETCH, PRIORITY_VISIBLE
+from ui.deck_animator import get_deck_animator
+
+# The largest scale a deck card is shown at; its render cache is sized for it
+MAX_DECK_SCALE = 1.2
+
+class DeckCard(QGraphicsObject):
+    """
+    Base class for the cards of the season and episode decks. Cards paint their
+    artwork, border and selection state themselves instead of embedding a QWidget
+    in a QGraphicsProxyWidget. The painted result is kept in an item coordinate
+    cache, so moving, scaling or rotating a card only transforms a cached pixmap;
+    the card is only repainted when its image or selection changes.
+    Subclasses set the card size and image size and implement paint_card().
+    """
+    def __init__(self, width, height, image_size, parent=None):
+        super().__init__(parent)
+        self.card_width = width
+        self.card_height = height
+        self.image_size = image_size
+        self.pixmap = None
+        self.selected = False
+        self.image_path = None
+        self.image_sources = []
+        self.waiting_for_image = False
+        self._rotation_y = 0
+        self.placed = False
+        self.dpr = QGuiApplication.primaryScreen().devicePixelRatio() if QGuiApplication.primaryScreen() else 1.0
+        cache_size = QSize(math.ceil(width * self.dpr * MAX_DECK_SCALE), math.ceil(height * self.dpr * MAX_DECK_SCALE))
+        self.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache, cache_size)
+        self.setTransformOriginPoint(self.boundingRect().center())
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.card_width, self.card_height)
+
+    @pyqtProperty(float)
+    def rotationY(self):
+        return self._rotation_y
+
+    @rotationY.setter
+    def rotationY(self, angle):
+        self._rotation_y = angle
+        transform = QTransform()
+        transform.rotate(self._rotation_y, Qt.Axis.YAxis)
+        self.setTransform(transform)
+
+    def animate_to(self, pos, scale, opacity, rotation):
+        """Moves the card to a new place in the deck over a few frames; a card that was never placed jumps there."""
+        if not self.placed:
+            self.set_properties_instantly(pos, scale, opacity, rotation)
+            return
+        get_deck_animator().animate(self, pos, scale, opacity, rotation)
+
+    def set_properties_instantly(self, pos, scale, opacity, rotation):
+        get_deck_animator().cancel(self)
+        self.placed = True
+        self.setPos(pos)
+        self.setScale(scale)
+        self.setOpacity(opacity)
+        self.rotationY = rotation # Use the property setter
+
+    def set_selected(self, selected):
+        if selected != self.selected:
+            self.selected = selected
+            self.update()
+
+    def load_image(self, sources):
+        """
+        Loads the first image of sources, a list of (path, local) pairs in order of
+        preference, falling back to the next one if it cannot be read.
+        """
+        self.image_sources = [(path, local) for path, local in sources if path]
+        self.pixmap = None
+        self.update()
+        self.request_next_image()
+
+    def request_next_image(self):
+        if not self.image_sources:
+            self.waiting_for_image = False
+            return
+        self.image_path, local = self.image_sources.pop(0)
+        self.waiting_for_image = True
+        get_image_loader().request(self.image_path, self.on_image_loaded, PRIORITY_PREFETCH, self.image_size, local, self.dpr)
+
+    def on_image_loaded(self, path, pixmap):
+        if path != self.image_path:
+            return
+        if pixmap is None:
+            self.request_next_image()
+            return
+        self.waiting_for_image = False
+        self.pixmap = pixmap
+        self.update()
+
+    def prioritize(self, priority):
+        """Moves a pending image load up, e.g. for the neighbours of the focused card."""
+        if self.waiting_for_image:
+            get_image_loader().prioritize(self.image_path, priority, self.image_size, self.dpr)
+
+    def paint(self, painter, option, widget=None):
+        self.prioritize(PRIORITY_VISIBLE)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        self.paint_card(painter)
+
+    def paint_card(self, painter):
+        raise NotImplementedError
+
+    def draw_image(self, painter, rect):
+        """Draws the card's image centered in rect, or a gray placeholder while there is none."""
+        if self.pixmap is None:
+            painter.fillRect(rect, Qt.GlobalColor.gray)
+            return
+        size = self.pixmap.deviceIndependentSize()
+        x = rect.x() + (rect.width() - size.width()) / 2
+        y = rect.y() + (rect.height() - size.height()) / 2
+        painter.drawPixmap(QRectF(x, y, size.width(), size.height()), self.pixmap, QRectF(self.pixmap.rect()))
+
+    def draw_border(self, painter, rect, color, width, radius=0):
+        pen = QPen(QColor(color), width)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        inset = width / 2
+        painter.drawRoundedRect(rect.adjusted(inset, inset, -inset, -inset), radius, radius)
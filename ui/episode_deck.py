@@ -0,0 +1,68 @@
+from ui.animated_episode_card import AnimatedEpisodeCard
+from ui.deck_animator import get_deck_animator
+
+# Cards kept alive on each side of the focused one; enough to fill the episode view
+DECK_WINDOW = 16
+
+class EpisodeDeck:
+    """
+    The episodes of the episode view, of which only the focused one and up to
+    window neighbours on each side have a card in the scene. As the focus moves,
+    cards that fall out of the window are recycled for the episodes coming into it,
+    so a season or podcast with thousands of episodes costs no more to show or
+    navigate than one with a few dozen.
+    """
+    def __init__(self, scene, window=DECK_WINDOW):
+        self.scene = scene
+        self.window = window
+        self.episodes = []
+        self.cards = {} # episode index -> card
+        self.spare_cards = []
+
+    def __len__(self):
+        return len(self.episodes)
+
+    def set_episodes(self, episodes):
+        for card in self.cards.values():
+            self.release(card)
+        self.cards = {}
+        self.episodes = list(episodes)
+
+    def episode(self, index):
+        return self.episodes[index] if 0 <= index < len(self.episodes) else None
+
+    def card(self, index):
+        """The card of an episode, or None if it is outside the window."""
+        return self.cards.get(index)
+
+    def update_window(self, current):
+        """
+        Makes sure the episodes within the window around current have a card and
+        returns them as a dict of episode index -> card.
+        """
+        first = max(current - self.window, 0)
+        last = min(current + self.window, len(self.episodes) - 1)
+        for index in [index for index in self.cards if not first <= index <= last]:
+            self.release(self.cards.pop(index))
+        for index in range(first, last + 1):
+            if index not in self.cards:
+                self.cards[index] = self.acquire(self.episodes[index])
+        return self.cards
+
+    def acquire(self, episode_data):
+        if self.spare_cards:
+            card = self.spare_cards.pop()
+            card.set_episode(episode_data)
+            card.show()
+        else:
+            card = AnimatedEpisodeCard(episode_data)
+            self.scene.addItem(card)
+        return card
+
+    def release(self, card):
+        # A recycled card starts at its new place instead of flying there from the old one
+        get_deck_animator().cancel(card)
+        card.placed = False
+        card.hide()
+        card.set_selected(False)
+        self.spare_cards.append(card)
@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt, QThreadPool
-from cache import get_image_from_cache, save_image_to_cache
-from worker import ImageDownloader, WorkerSignals
+from PyQt6.QtCore import Qt
+from cache import get_pixmap_cache
+from image_loader import get_image_loader, PRIORITY_PREFETCH, PRIORITY_VISIBLE, STILL_SIZE
 
 class EpisodeWidget(QWidget):
     """
@@ -12,10 +12,10 @@ class EpisodeWidget(QWidget):
         super().__init__(parent)
         self.episode_data = episode_data
         self.pixmap = None
-        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else {}
-        self.threadpool = QThreadPool()
-        self.signals = WorkerSignals()
-        self.signals.download_finished.connect(self.on_download_finished)
+        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else get_pixmap_cache()
+        self.image_path = None
+        self.waiting_for_still = False
+        self.local_still_failed = False
         self.initUI()
         self.set_poster()
 
@@ -30,37 +30,51 @@ class EpisodeWidget(QWidget):
         layout.addWidget(self.poster_label)
 
     def set_poster(self):
-        still_path = self.episode_data.get('still_path')
-        if still_path in self.pixmap_cache:
-            self.pixmap = self.pixmap_cache[still_path]
-            self.update_poster()
-        elif still_path:
-            cached_pixmap = get_image_from_cache(still_path)
-            if cached_pixmap:
-                self.pixmap = cached_pixmap
-                self.pixmap_cache[still_path] = self.pixmap
-                self.update_poster()
-            else:
-                self.set_placeholder()
-                self.download_poster(still_path)
+        # Artwork found next to the episode wins over TMDb and needs no download
+        if self.episode_data.get('local_still') and not self.local_still_failed:
+            self.request_still(self.episode_data['local_still'], local=True)
+        elif self.episode_data.get('still_path'):
+            self.request_still(self.episode_data['still_path'])
         else:
             self.set_placeholder()
 
-    def download_poster(self, still_path):
-        worker = ImageDownloader(still_path, self.signals)
-        self.threadpool.start(worker)
+    def request_still(self, path, local=False):
+        # Queued at the lowest priority; paintEvent moves it up once the card is on screen
+        self.image_path = path
+        self.waiting_for_still = True
+        get_image_loader().request(path, self.on_image_loaded, PRIORITY_PREFETCH, STILL_SIZE, local, self.devicePixelRatioF())
+        if self.waiting_for_still:
+            self.set_placeholder()
+
+    def on_image_loaded(self, path, pixmap):
+        if path != self.image_path:
+            return
+        self.waiting_for_still = False
+        if pixmap is None:
+            if path == self.episode_data.get('local_still'):
+                # Unreadable local artwork, fall back to the TMDb still
+                self.local_still_failed = True
+                self.set_poster()
+            return
+        self.pixmap = pixmap
+        self.update_poster()
+
+    def prioritize(self, priority):
+        """Moves a pending still load up, e.g. for the neighbours of the focused card."""
+        if self.waiting_for_still:
+            get_image_loader().prioritize(self.image_path, priority, STILL_SIZE, self.devicePixelRatioF())
 
-    def on_download_finished(self, still_path, image_data):
-        if still_path == self.episode_data.get('still_path'):
-            save_image_to_cache(still_path, image_data)
-            self.pixmap = QPixmap()
-            self.pixmap.loadFromData(image_data)
-            self.pixmap_cache[still_path] = self.pixmap
-            self.update_poster()
+    def paintEvent(self, event):
+        self.prioritize(PRIORITY_VISIBLE)
+        super().paintEvent(event)
 
     def update_poster(self):
-        scaled_pixmap = self.pixmap.scaled(200, 112, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        self.poster_label.setPixmap(scaled_pixmap)
+        # Loaded stills are decoded at thumbnail size already; only rescale anything larger
+        pixmap = self.pixmap
+        size = pixmap.deviceIndependentSize()
+        if size.width() > 200 or size.height() > 112:
+            pixmap = pixmap.scaled(200, 112, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.poster_label.setPixmap(pixmap)
 
     def set_placeholder(self):
         if not self.pixmap:
@@ -0,0 +1,66 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QRectF
+from instrumentation import BUCKET_BOUNDS
+
+# Milliseconds between refreshes of the overlay
+REFRESH_INTERVAL = 500
+
+class InstrumentationOverlay(QWidget):
+    """
+    A small translucent panel showing the Instrumentation metrics and a histogram
+    of the key latency over the recent key presses. Placed in the top right corner
+    of its parent and refreshed twice a second while visible.
+    """
+    def __init__(self, instrumentation, parent=None):
+        super().__init__(parent)
+        self.instrumentation = instrumentation
+        self.instrumentation.ignore(self)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setFixedSize(320, 170)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.update)
+        self.hide()
+
+    def showEvent(self, event):
+        if self.parentWidget():
+            self.move(self.parentWidget().width() - self.width() - 10, 10)
+        self.raise_()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 190))
+        painter.drawRoundedRect(QRectF(self.rect()), 6, 6)
+
+        painter.setFont(QFont("monospace", 8))
+        painter.setPen(QColor("white"))
+        y = 16
+        for label, metric in (("key->paint", self.instrumentation.key_latency),
+                              ("deck frame", self.instrumentation.frame_interval),
+                              ("stalls", self.instrumentation.stalls)):
+            summary = metric.summary()
+            painter.drawText(8, y, f"{label:<10} p50 {summary['p50_ms']:5.1f} p95 {summary['p95_ms']:5.1f} max {summary['max_ms']:5.0f} ms")
+            y += 14
+        painter.drawText(8, y, f"stalls over {self.instrumentation.stall_threshold} ms: {self.instrumentation.stalls.total}  Shift+F12: dump")
+
+        # Key latency histogram, one bar per bucket
+        counts = self.instrumentation.key_latency.histogram()
+        labels = [str(bound) for bound in BUCKET_BOUNDS] + ['>']
+        chart = QRectF(8, y + 10, self.width() - 16, self.height() - y - 30)
+        bar_width = chart.width() / len(counts)
+        peak = max(counts) or 1
+        for i, count in enumerate(counts):
+            height = chart.height() * count / peak
+            x = chart.x() + i * bar_width
+            painter.fillRect(QRectF(x + 1, chart.bottom() - height, bar_width - 2, height),
+                             QColor("#0090ff") if i < 2 else QColor("#e0a000") if i < 4 else QColor("#e04040"))
+            painter.drawText(QRectF(x, chart.bottom() + 2, bar_width, 12), Qt.AlignmentFlag.AlignHCenter, labels[i])
@@ -1,12 +1,15 @@
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene
 from PyQt6.QtCore import pyqtSignal, Qt, QPointF, QTimer
 from ui.category_widgets import ClickableCategoryCard
+from ui.widgets import CardSelection
 
 class MainView(QGraphicsView):
     category_selected = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, selection=None, parent=None):
         super().__init__(parent)
+        # The highlighted card is owned by the selection; the deck is only laid out around it
+        self.selection = selection if selection is not None else CardSelection()
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -27,14 +30,24 @@ class MainView(QGraphicsView):
         self.scene.addItem(self.podcasts_card)
 
         self.cards = [self.movies_card, self.shows_card, self.podcasts_card]
-        self.current_selection_index = 0
-        
+        # Index of the category card last selected; the deck stays there while none is
+        self.last_focused_index = 0
+
         # Initial positioning and selection update
         QTimer.singleShot(10, self.update_card_positions) # Delay to ensure view is ready
 
+    def focused_index(self):
+        """The index of the selected category card, or of the last one selected while none is."""
+        for i, card in enumerate(self.cards):
+            if card is self.selection.card:
+                self.last_focused_index = i
+                break
+        return self.last_focused_index
+
     def update_card_positions(self):
         if not self.cards:
             return
+        focused_index = self.focused_index()
 
         view_width = self.viewport().width()
         card_width = self.cards[0].boundingRect().width()
@@ -45,12 +58,12 @@ class MainView(QGraphicsView):
         end_x = view_width * 0.85
         
         if num_cards > 1:
-            focal_point_x = start_x + (self.current_selection_index / (num_cards - 1)) * (end_x - start_x)
+            focal_point_x = start_x + (focused_index / (num_cards - 1)) * (end_x - start_x)
         else:
             focal_point_x = view_width / 2
 
         for i, card in enumerate(self.cards):
-            distance = i - self.current_selection_index
+            distance = i - focused_index
 
             card_spacing = 30
             offset = distance * (card_width * 0.4 + card_spacing)
@@ -60,12 +73,10 @@ class MainView(QGraphicsView):
                 scale = 1.0
                 opacity = 1.0
                 rotation = 0
-                card.set_selected(True)
                 card.setZValue(num_cards) # Bring selected card to front
             else:
                 scale = 0.8
                 opacity = 0.7
-                card.set_selected(False)
                 card.setZValue(num_cards - abs(distance)) # Order other cards by distance
                 
                 if distance < 0:
@@ -0,0 +1,153 @@
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtGui import QColor, QPen
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect
+from cache import get_pixmap_cache
+from image_loader import get_image_loader, image_key, PRIORITY_VISIBLE, POSTER_SIZE
+
+GRID_COLUMNS = 4
+CARD_WIDTH, CARD_HEIGHT = 200, 350
+POSTER_WIDTH, POSTER_HEIGHT = POSTER_SIZE
+
+class MediaGridModel(QAbstractListModel):
+    """
+    A list model over movie/show/podcast dicts for MediaGridView.
+    Posters are only loaded when the delegate asks for a visible row.
+    """
+    def __init__(self, pixmap_cache=None, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else get_pixmap_cache()
+        self.failed = set()
+        # Artwork path -> rows waiting for it, so a finished load repaints only those rows
+        self.waiting_rows = {}
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.items = list(items)
+        self.waiting_rows = {}
+        self.endResetModel()
+
+    def update_item(self, row, item):
+        if 0 <= row < len(self.items):
+            self.items[row] = item
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.items):
+            return None
+        item = self.items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.get('title')
+        if role == Qt.ItemDataRole.UserRole:
+            return item
+        return None
+
+    def poster(self, row, dpr=1.0):
+        """
+        Returns the poster for a row at card size, or None while it is still loading or
+        could not be loaded, in which case the placeholder is painted.
+        Only called while painting, so the row is on screen.
+        """
+        item = self.items[row]
+        local = bool(item.get('local_poster')) and item['local_poster'] not in self.failed
+        path = item.get('local_poster') if local else item.get('poster_path')
+        # A poster that failed once is not requested again on every repaint
+        if not path or path in self.failed:
+            return None
+        pixmap = self.pixmap_cache.get(image_key(path, POSTER_SIZE, dpr))
+        if pixmap is None:
+            self.waiting_rows.setdefault(path, set()).add(row)
+            get_image_loader().request(path, self.on_image_loaded, PRIORITY_VISIBLE, POSTER_SIZE, local, dpr)
+        return pixmap
+
+    def on_image_loaded(self, path, pixmap):
+        if pixmap is None:
+            # Unreadable local artwork falls back to the TMDb poster; a failed TMDb poster to the placeholder
+            self.failed.add(path)
+        for row in self.waiting_rows.pop(path, ()):
+            if row < len(self.items):
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+class PosterDelegate(QStyledItemDelegate):
+    """
+    Paints a poster card (artwork, title, year and selection border) straight onto the view,
+    so no per-item widgets exist.
+    """
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = QRect(option.rect.x() + (option.rect.width() - CARD_WIDTH) // 2, option.rect.y(), CARD_WIDTH, CARD_HEIGHT)
+        item = index.data(Qt.ItemDataRole.UserRole)
+
+        poster_rect = QRect(rect.x(), rect.y() + 5, POSTER_WIDTH, POSTER_HEIGHT)
+        poster = index.model().poster(index.row(), painter.device().devicePixelRatioF())
+        if poster is None:
+            painter.fillRect(poster_rect, Qt.GlobalColor.gray)
+        else:
+            size = poster.deviceIndependentSize()
+            x = poster_rect.x() + (POSTER_WIDTH - int(size.width())) // 2
+            y = poster_rect.y() + (POSTER_HEIGHT - int(size.height())) // 2
+            painter.drawPixmap(x, y, poster)
+
+        text = item.get('title') or ''
+        if item.get('year') is not None:
+            text = f"{text}\n{item['year']}"
+        text_rect = QRect(rect.x(), poster_rect.bottom() + 2, rect.width(), rect.bottom() - poster_rect.bottom() - 2)
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap, text)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(QPen(QColor("#0078D7"), 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(rect.adjusted(1, 1, -1, -1))
+        painter.restore()
+
+class MediaGridView(QListView):
+    """
+    A virtualized poster grid for large libraries. Only the rows in view are painted,
+    so the cost no longer grows with the number of items. Selection is driven by Codex
+    through select(), keeping the J/K/U/D navigation of the widget grids.
+    """
+    def __init__(self, pixmap_cache=None, parent=None):
+        super().__init__(parent)
+        self.grid_model = MediaGridModel(pixmap_cache, self)
+        self.setModel(self.grid_model)
+        self.setItemDelegate(PosterDelegate(self))
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus) # Keys are handled by Codex.keyPressEvent
+        self.setGridSize(QSize(CARD_WIDTH + 20, CARD_HEIGHT + 10))
+
+    def set_items(self, items):
+        self.grid_model.set_items(items)
+
+    def update_item(self, row, item):
+        self.grid_model.update_item(row, item)
+
+    def row_count(self):
+        """Number of grid rows needed to show every item."""
+        return (self.grid_model.rowCount() + GRID_COLUMNS - 1) // GRID_COLUMNS
+
+    def select(self, row):
+        if 0 <= row < self.grid_model.rowCount():
+            index = self.grid_model.index(row)
+            self.setCurrentIndex(index)
+            self.scrollTo(index)
+
+    def resizeEvent(self, event):
+        # Keep exactly GRID_COLUMNS cards per row, like the widget grids
+        self.setGridSize(QSize(max(self.viewport().width() // GRID_COLUMNS, CARD_WIDTH), CARD_HEIGHT + 10))
+        super().resizeEvent(event)
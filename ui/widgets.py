@@ -1,8 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt, pyqtSignal, QThreadPool
-from cache import get_image_from_cache, save_image_to_cache
-from worker import ImageDownloader, WorkerSignals
+from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QPalette
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF
+from image_loader import get_image_loader, PRIORITY_PREFETCH, PRIORITY_VISIBLE, POSTER_SIZE
 
 class ClickableQWidget(QWidget):
     clicked = pyqtSignal()
@@ -15,16 +14,16 @@ class MediaCard(ClickableQWidget):
     """
     A widget to display media information in a card format.
     """
-    def __init__(self, title, poster_path=None, year=None, pixmap_cache=None, parent=None):
+    def __init__(self, title, poster_path=None, year=None, parent=None, local_poster=None):
         super().__init__(parent)
         self.title = title
         self.year = year
         self.poster_path = poster_path
+        self.local_poster = local_poster
         self.pixmap = None
-        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else {}
-        self.threadpool = QThreadPool()
-        self.signals = WorkerSignals()
-        self.signals.download_finished.connect(self.on_download_finished)
+        self.image_path = None
+        self.waiting_for_poster = False
+        self.selected = False
         self.initUI()
         self.set_poster()
 
@@ -47,37 +46,74 @@ class MediaCard(ClickableQWidget):
             self.year_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             layout.addWidget(self.year_label)
 
+        # Light text on the dark card frame painted in paintEvent
+        palette = self.palette()
+        palette.setColor(QPalette.ColorRole.WindowText, QColor("#ddd"))
+        self.setPalette(palette)
+
     def set_poster(self):
-        if self.poster_path in self.pixmap_cache:
-            self.pixmap = self.pixmap_cache[self.poster_path]
-            self.update_poster()
+        # Artwork found next to the media wins over TMDb and needs no download
+        if self.local_poster:
+            self.request_poster(self.local_poster, local=True)
         elif self.poster_path:
-            cached_pixmap = get_image_from_cache(self.poster_path)
-            if cached_pixmap:
-                self.pixmap = cached_pixmap
-                self.pixmap_cache[self.poster_path] = self.pixmap
-                self.update_poster()
-            else:
-                self.set_placeholder()
-                self.download_poster()
+            self.request_poster(self.poster_path)
         else:
             self.set_placeholder()
 
-    def download_poster(self):
-        worker = ImageDownloader(self.poster_path, self.signals)
-        self.threadpool.start(worker)
-
-    def on_download_finished(self, poster_path, image_data):
+    def set_poster_path(self, poster_path):
+        """Switches the card to a new TMDb poster, e.g. once metadata for it has arrived."""
         if poster_path == self.poster_path:
-            save_image_to_cache(poster_path, image_data)
-            self.pixmap = QPixmap()
-            self.pixmap.loadFromData(image_data)
-            self.pixmap_cache[poster_path] = self.pixmap
-            self.update_poster()
+            return
+        self.poster_path = poster_path
+        self.set_poster()
+
+    def request_poster(self, path, local=False):
+        # Queued at the lowest priority; paintEvent moves it up once the card is on screen
+        self.image_path = path
+        self.waiting_for_poster = True
+        get_image_loader().request(path, self.on_image_loaded, PRIORITY_PREFETCH, POSTER_SIZE, local, self.devicePixelRatioF())
+        if self.waiting_for_poster:
+            self.set_placeholder()
+
+    def on_image_loaded(self, path, pixmap):
+        if path != self.image_path:
+            return
+        self.waiting_for_poster = False
+        if pixmap is None:
+            if path == self.local_poster:
+                # Unreadable local artwork, fall back to the TMDb poster
+                self.local_poster = None
+                self.set_poster()
+            return
+        self.pixmap = pixmap
+        self.update_poster()
+
+    def prioritize(self, priority):
+        """Moves a pending poster load up, e.g. for the neighbours of the focused card."""
+        if self.waiting_for_poster:
+            get_image_loader().prioritize(self.image_path, priority, POSTER_SIZE, self.devicePixelRatioF())
+
+    def paintEvent(self, event):
+        self.prioritize(PRIORITY_VISIBLE)
+        super().paintEvent(event)
+        # The card's frame, drawn under the poster and title labels
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self.selected:
+            painter.setPen(QPen(QColor("#0078D7"), 2))
+            painter.setBrush(QColor("#444"))
+        else:
+            painter.setPen(QPen(QColor("#555"), 2))
+            painter.setBrush(QColor("#333"))
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(1, 1, -1, -1), 10, 10)
 
     def update_poster(self):
-        scaled_pixmap = self.pixmap.scaled(200, 300, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        self.poster_label.setPixmap(scaled_pixmap)
+        # Loaded posters are decoded at card size already; only rescale anything larger
+        pixmap = self.pixmap
+        size = pixmap.deviceIndependentSize()
+        if size.width() > 200 or size.height() > 300:
+            pixmap = pixmap.scaled(200, 300, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.poster_label.setPixmap(pixmap)
 
     def set_placeholder(self):
         if not self.pixmap:
@@ -86,7 +122,31 @@ class MediaCard(ClickableQWidget):
         self.update_poster()
 
     def set_selected(self, selected):
-        if selected:
-            self.setStyleSheet("background-color: #444; border: 2px solid #0078D7; border-radius: 10px;")
-        else:
-            self.setStyleSheet("background-color: #333; border: 2px solid #555; border-radius: 10px;")
\ No newline at end of file
+        # The highlight is painted, so changing it only repaints this card instead of re-polishing its style
+        if selected != self.selected:
+            self.selected = selected
+            self.update()
+
+class CardSelection:
+    """
+    Remembers which card is highlighted, so moving the selection only touches the
+    previously selected card and the new one, however many cards there are.
+    """
+    def __init__(self):
+        self.card = None
+
+    def select(self, card):
+        if card is self.card:
+            return
+        if self.card is not None:
+            try:
+                self.card.set_selected(False)
+            except RuntimeError:
+                # The card was deleted by Qt when its grid was rebuilt
+                pass
+        self.card = card
+        if card is not None:
+            card.set_selected(True)
+
+    def clear(self):
+        self.select(None)
@@ -1,137 +1,497 @@
+import copy
+import datetime
 import os
 import re
 import requests
-from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
-from tmdb import TMDbAPI
-from cache import CACHE_DIR, get_cache_path
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QBuffer, QByteArray, QIODevice, QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader
+from tmdb import TMDbAPI, SessionPool
+from cache import get_disk_cache, load_from_cache, save_image_to_cache, save_derivative_to_cache
+from catalog import MetadataCatalog, file_signature
+from config import get_setting
+from title_index import TitleIndex, title_year
+
+# Default number of TMDb requests MetadataWorker keeps in flight
+DEFAULT_METADATA_CONCURRENCY = 8
+# Metadata is streamed to the GUI in batches of at most this many items, or whatever
+# arrived within this many seconds, whichever comes first
+METADATA_BATCH_SIZE = 25
+METADATA_BATCH_INTERVAL = 0.1
+# Beyond this many days since the last sync, replaying the /changes feeds costs more
+# requests than simply refreshing every catalog entry
+MAX_SYNC_DAYS = 56
+
+IMAGE_BASE_URL = 'https://image.tmdb.org/t/p'
+# TMDb image size variants, by the width they are served at
+POSTER_VARIANTS = ('w92', 'w154', 'w185', 'w342', 'w500', 'w780')
+STILL_VARIANTS = ('w92', 'w185', 'w300')
+# Keep-alive connections to the image host, shared by every ImageLoadWorker
+image_sessions = SessionPool(pool_size=get_setting('image_pool_size', 8))
 
 class WorkerSignals(QObject):
     """
     Defines the signals available from a running worker thread.
     """
-    download_finished = pyqtSignal(str, bytes)
+    # (key, QImage) for an image decoded at its display size, or the key of one that failed
+    image_loaded = pyqtSignal(str, object)
+    image_failed = pyqtSignal(str)
     metadata_finished = pyqtSignal(list, list, list)
-    cache_cleanup_finished = pyqtSignal()
+    # {category: {index: item}} for items whose metadata arrived since the previous batch
+    metadata_batch = pyqtSignal(object)
+
+def image_variants(size):
+    """
+    The TMDb size variants that are wide enough for an image shown at size (width,
+    height) device pixels, smallest first, ending with 'original'. Landscape sizes
+    are episode stills, which come in different variants than posters.
+    """
+    variants = STILL_VARIANTS if size[0] > size[1] else POSTER_VARIANTS
+    return [variant for variant in variants if int(variant[1:]) >= size[0]] + ['original']
+
+def read_scaled_image(source, size):
+    """
+    Decodes an image file or QIODevice straight to at most size (width, height),
+    keeping its aspect ratio. For JPEGs QImageReader scales while decoding, which is
+    much cheaper than decoding at full size and rescaling afterwards.
+    """
+    reader = QImageReader(source)
+    reader.setAutoTransform(True)
+    original = reader.size()
+    target = QSize(*size)
+    if original.isValid() and (original.width() > target.width() or original.height() > target.height()):
+        reader.setScaledSize(original.scaled(target, Qt.AspectRatioMode.KeepAspectRatio))
+    return reader.read()
 
-class ImageDownloader(QRunnable):
+class ImageLoadWorker(QRunnable):
     """
-    A QRunnable worker to download an image in the background.
+    A QRunnable worker that loads an image at its display size, off the GUI thread.
+    TMDb images come from the pre-scaled derivative in the disk cache if there is one,
+    otherwise from any cached size variant that is large enough, and only otherwise
+    from a download of the smallest variant that covers size. New derivatives are
+    written back.
+    Local artwork is decoded from its file at the requested size.
     """
-    def __init__(self, poster_path, signals):
+    def __init__(self, key, path, size, signals, local=False):
         super().__init__()
-        self.poster_path = poster_path
+        self.key = key
+        self.path = path
+        self.size = size
         self.signals = signals
+        self.local = local
 
     def run(self):
-        """Execute the download."""
-        if not self.poster_path:
-            return
-
         try:
-            image_url = f"https://image.tmdb.org/t/p/w500{self.poster_path}"
-            response = requests.get(image_url, stream=True)
+            image = self.load()
+        except requests.exceptions.RequestException as e:
+            print(f"Error downloading image {self.path}: {e}")
+            image = None
+        if image is None or image.isNull():
+            self.signals.image_failed.emit(self.key)
+        else:
+            self.signals.image_loaded.emit(self.key, image)
+
+    def load(self):
+        if self.local:
+            return read_scaled_image(self.path, self.size)
+
+        derivative = load_from_cache(self.path, self.size)
+        if derivative:
+            image = QImage.fromData(derivative)
+            if not image.isNull():
+                return image
+
+        variants = image_variants(self.size)
+        image_data = next((data for data in (load_from_cache(self.path, variant=variant) for variant in variants) if data), None)
+        if image_data is None:
+            response = image_sessions.get(f"{IMAGE_BASE_URL}/{variants[0]}{self.path}")
             response.raise_for_status()
             image_data = response.content
-            self.signals.download_finished.emit(self.poster_path, image_data)
-        except requests.exceptions.RequestException as e:
-            print(f"Error downloading image {self.poster_path}: {e}")
+            save_image_to_cache(self.path, image_data, variants[0])
+        buffer = QBuffer()
+        buffer.setData(QByteArray(image_data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        image = read_scaled_image(buffer, self.size)
+        if not image.isNull():
+            save_derivative_to_cache(self.path, self.size, image)
+        return image
 
 class MetadataWorker(QRunnable):
     """
     A QRunnable worker to fetch all metadata in the background.
+    Updated items are streamed to the GUI through metadata_batch while the fetch is
+    still running; metadata_finished follows once everything has been fetched.
+    Entries already resolved in the persistent catalog are only re-fetched from
+    TMDb when their local path, size or mtime changed. The remaining searches and
+    season fetches run concurrently on a bounded thread pool; every result is merged
+    into the dict of the item that requested it, so the outcome does not depend on
+    the order in which requests complete.
+    In sync mode, catalog entries whose TMDb id shows up in the /changes feeds since
+    the last sync are re-pulled from the detail endpoints even if the local files
+    did not change.
     """
-    def __init__(self, movies, shows, podcasts, signals):
+    def __init__(self, movies, shows, podcasts, signals, tmdb_api=None, max_workers=None, sync=None):
         super().__init__()
         self.movies = movies
         self.shows = shows
         self.podcasts = podcasts
         self.signals = signals
-        self.tmdb_api = TMDbAPI('df63e75244330de0737ce6f6d2f688ce')
+        self.max_workers = max_workers or get_setting('metadata_concurrency', DEFAULT_METADATA_CONCURRENCY)
+        # Size the connection pool to match, so every in-flight request can reuse a connection
+        self.tmdb_api = tmdb_api or TMDbAPI('df63e75244330de0737ce6f6d2f688ce', pool_size=self.max_workers)
+        self.sync = get_setting('metadata_sync', True) if sync is None else sync
 
     def run(self):
         """Execute the metadata fetching."""
-        import time
         start_time = time.time()
-        for movie in self.movies:
-            search_results = self.tmdb_api.search_movie(movie['title'], movie['year'])
-            if search_results and 'results' in search_results and search_results['results']:
-                movie['poster_path'] = search_results['results'][0].get('poster_path')
+        catalog = MetadataCatalog()
+        # Where each item sits in the lists, so batches can address the matching cards
+        self.positions = {}
+        for category, items in (('movies', self.movies), ('shows', self.shows), ('podcasts', self.podcasts)):
+            for index, item in enumerate(items):
+                self.positions[id(item)] = (category, index, item)
+        self.batch = set()
+        self.last_flush = time.monotonic()
+        self.catalog_hits = 0
+        self.catalog_misses = 0
+        self.refreshed = 0
+        # Set when a refresh of a changed title fails, so the sync point is not moved past it
+        self.refresh_failed = False
+        self.direct_lookups = 0
+        self.changed, sync_date = self.read_changes(catalog)
+        # Titles in the offline index resolve to an id without a search request
+        self.title_index = TitleIndex() if TitleIndex.exists() else None
 
-        for show in self.shows:
-            search_results = self.tmdb_api.search_show(show['title'])
-            if search_results and 'results' in search_results and search_results['results']:
-                show['poster_path'] = search_results['results'][0].get('poster_path')
-                show['id'] = search_results['results'][0].get('id')
-                
-                for season in show['seasons']:
-                    season_number_match = re.search(r'\d+', season['name'])
-                    if season_number_match:
-                        season_number = int(season_number_match.group())
-                        season_details = self.tmdb_api.get_show_season_details(show['id'], season_number)
-                        if season_details:
-                            season['poster_path'] = season_details.get('poster_path')
-                            processed_episodes = []
-                            # Get local episodes for this season to merge paths
-                            local_episodes_for_season = self.shows[self.shows.index(show)]['seasons'][self.shows[self.shows.index(show)]['seasons'].index(season)].get('episodes', [])
-                            local_episode_paths = {ep.get('episode_number'): ep.get('path') for ep in local_episodes_for_season if ep.get('episode_number') is not None}
-
-                            for episode in season_details.get('episodes', []):
-                                episode_num = episode.get('episode_number')
-                                episode_path = local_episode_paths.get(episode_num) # Get path from local data
-
-                                processed_episodes.append({
-                                    'episode_number': episode_num,
-                                    'name': episode.get('name'),
-                                    'still_path': episode.get('still_path'),
-                                    'path': episode_path # Include the local path
-                                })
-                            season['episodes_details'] = processed_episodes
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.executor = executor
+            self.pending = {}
+            for movie in self.movies:
+                self.resolve_movie(catalog, movie)
+            for show in self.shows:
+                self.resolve_show(catalog, show)
+            self.drain()
+        # Every response cached during the sync is written in one transaction
+        self.tmdb_api.commit()
 
         # No external metadata fetching for podcasts for now
         for podcast in self.podcasts:
             podcast['poster_path'] = None # No poster from TMDb
+        self.flush()
+
+        valid_paths = [movie['path'] for movie in self.movies]
+        for show in self.shows:
+            valid_paths.append(show['path'])
+            valid_paths.extend(season.get('path') for season in show['seasons'])
+        catalog.prune(valid_paths)
+        if self.sync and sync_date and not self.refresh_failed:
+            catalog.set_meta('last_sync', sync_date.isoformat())
+        elif self.refresh_failed:
+            print("Some changed titles could not be refreshed, will retry them on the next launch.")
+        catalog.close()
+        if self.title_index:
+            self.title_index.close()
 
         end_time = time.time()
-        print(f"Metadata fetching completed in {end_time - start_time:.2f} seconds.")
+        print(f"Metadata fetching completed in {end_time - start_time:.2f} seconds "
+              f"({self.catalog_hits} catalog hits, {self.catalog_misses} TMDb lookups ({self.direct_lookups} without search), {self.refreshed} refreshed, "
+              f"{self.max_workers} concurrent requests).")
         self.signals.metadata_finished.emit(self.movies, self.shows, self.podcasts)
 
-class CacheCleanupWorker(QRunnable):
-    """
-    A QRunnable worker to clean up the cache.
-    """
-    def __init__(self, movies, shows, signals):
-        super().__init__()
-        self.movies = movies
-        self.shows = shows
-        self.signals = signals
+    def read_changes(self, catalog):
+        """
+        Reads the TMDb /changes feeds since the last sync. Returns the changed ids per media type
+        ('movie' and 'tv') that are present in the catalog, and the date to record as the new
+        sync point, or None if the feeds could not be read and the sync point must stay put.
+        """
+        changed = {'movie': set(), 'tv': set()}
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        last_sync = catalog.get_meta('last_sync')
+        if not self.sync or last_sync is None:
+            return changed, today
 
-    def run(self):
-        """Execute the cleanup."""
-        print("Starting cache cleanup...")
-        import time
-        start_time = time.time()
-        if not os.path.exists(CACHE_DIR):
+        since = datetime.date.fromisoformat(last_sync)
+        if (today - since).days > MAX_SYNC_DAYS:
+            # Too far behind to replay the feeds cheaply, so refresh every known title instead
+            print(f"Last metadata sync was on {last_sync}, refreshing all titles.")
+            return {'movie': catalog.tmdb_ids('movie'), 'tv': catalog.tmdb_ids('show')}, today
+
+        for media_type, kind in (('movie', 'movie'), ('tv', 'show')):
+            changed_ids = self.tmdb_api.get_changed_ids(media_type, since, today)
+            if changed_ids is None:
+                print(f"Could not read the TMDb {media_type} changes feed, will retry on the next launch.")
+                return changed, None
+            changed[media_type] = changed_ids & catalog.tmdb_ids(kind)
+        return changed, today
+
+    def submit(self, fetch, args, on_result, item, refresh=False):
+        """
+        Queues a TMDb call on the pool; on_result runs on this worker's thread once it completes,
+        after which the movie or show item it was made for is reported in the next batch.
+        """
+        self.pending[self.executor.submit(fetch, *args)] = (on_result, item, refresh)
+
+    def updated(self, item):
+        """Marks a movie or show as having new metadata for the next metadata_batch."""
+        self.batch.add(id(item))
+        if len(self.batch) >= METADATA_BATCH_SIZE or time.monotonic() - self.last_flush >= METADATA_BATCH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """
+        Emits the items updated since the last batch as {category: {index: item}}.
+        Items are deep-copied so the GUI never shares dicts this thread is still writing to.
+        """
+        self.last_flush = time.monotonic()
+        if not self.batch:
             return
+        batch = {}
+        for item_id in self.batch:
+            category, index, item = self.positions[item_id]
+            batch.setdefault(category, {})[index] = copy.deepcopy(item)
+        self.batch = set()
+        self.signals.metadata_batch.emit(batch)
 
-        valid_cache_files = set()
-        for movie in self.movies:
-            if movie.get('poster_path'):
-                valid_cache_files.add(os.path.basename(get_cache_path(movie['poster_path'])))
-        
-        for show in self.shows:
-            if show.get('poster_path'):
-                valid_cache_files.add(os.path.basename(get_cache_path(show['poster_path'])))
-            for season in show.get('seasons', []):
-                if season.get('poster_path'):
-                    valid_cache_files.add(os.path.basename(get_cache_path(season['poster_path'])))
-
-        for filename in os.listdir(CACHE_DIR):
-            if filename not in valid_cache_files:
+    def drain(self):
+        """Merges results as requests complete until no requests are left, including ones queued while merging."""
+        while self.pending:
+            done, _ = wait(list(self.pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                on_result, item, refresh = self.pending.pop(future)
                 try:
-                    os.remove(os.path.join(CACHE_DIR, filename))
-                except OSError as e:
-                    print(f"Error removing cached file: {e}")
-        end_time = time.time()
-        print(f"Cache cleanup completed in {end_time - start_time:.2f} seconds.")
-        self.signals.cache_cleanup_finished.emit()
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error fetching metadata: {e}")
+                    if refresh:
+                        self.refresh_failed = True
+                    continue
+                on_result(result)
+                self.updated(item)
+
+    def resolve_movie(self, catalog, movie):
+        signature = file_signature(movie['path'])
+        cached = catalog.lookup('movie', movie['path'], signature)
+        if cached is not None:
+            movie['id'] = cached.get('id')
+            movie['poster_path'] = cached.get('poster_path')
+            if movie['id'] in self.changed['movie']:
+                self.refreshed += 1
+                self.fetch_movie_by_id(catalog, movie, signature, movie['id'], refresh=True)
+            else:
+                self.catalog_hits += 1
+            self.updated(movie)
+            return
+
+        self.catalog_misses += 1
+        # Ids tagged in the library or found in the offline index skip the search request
+        movie_id = movie.get('tmdb_id')
+        expected_year = None
+        if movie_id is None and not movie.get('imdb_id') and self.title_index:
+            movie_id = self.title_index.lookup('movie', movie['title'])
+            # The index matches on the original title alone, so its match is checked against the year
+            expected_year = movie['year']
+        if movie_id is not None:
+            self.direct_lookups += 1
+            self.fetch_movie_by_id(catalog, movie, signature, movie_id, expected_year=expected_year)
+        elif movie.get('imdb_id'):
+            self.direct_lookups += 1
+            self.submit(self.tmdb_api.find_by_imdb_id, (movie['imdb_id'],),
+                        partial(self.on_movie_find, catalog, movie, signature), movie)
+        else:
+            self.search_movie(catalog, movie, signature)
+
+    def search_movie(self, catalog, movie, signature):
+        self.submit(self.tmdb_api.search_movie, (movie['title'], movie['year']),
+                    partial(self.on_movie_search, catalog, movie, signature), movie)
+
+    def fetch_movie_by_id(self, catalog, movie, signature, movie_id, refresh=False, expected_year=None):
+        movie['id'] = movie_id
+        self.submit(self.tmdb_api.get_movie_details, (movie_id, refresh),
+                    partial(self.on_movie_details, catalog, movie, signature, refresh, expected_year), movie, refresh)
+
+    def on_movie_search(self, catalog, movie, signature, search_results):
+        if search_results and 'results' in search_results and search_results['results']:
+            movie['id'] = search_results['results'][0].get('id')
+            movie['poster_path'] = search_results['results'][0].get('poster_path')
+            catalog.store('movie', movie['path'], signature, movie['id'],
+                          {'id': movie['id'], 'poster_path': movie['poster_path']})
+
+    def on_movie_find(self, catalog, movie, signature, find_results):
+        if find_results and find_results.get('movie_results'):
+            self.on_movie_search(catalog, movie, signature, {'results': find_results['movie_results']})
+        else:
+            self.search_movie(catalog, movie, signature)
+
+    def on_movie_details(self, catalog, movie, signature, refresh, expected_year, details):
+        if details and not release_year_matches(details.get('release_date'), expected_year):
+            # A different title that shares the original title; search by title and year instead
+            movie['id'] = None
+            self.search_movie(catalog, movie, signature)
+        elif details:
+            movie['poster_path'] = details.get('poster_path')
+            catalog.store('movie', movie['path'], signature, movie['id'],
+                          {'id': movie['id'], 'poster_path': movie['poster_path']})
+        elif refresh:
+            self.refresh_failed = True
+        else:
+            # The id we went straight to did not resolve, so fall back to searching by title
+            movie['id'] = None
+            self.search_movie(catalog, movie, signature)
+
+    def resolve_show(self, catalog, show):
+        signature = file_signature(show['path'])
+        cached = catalog.lookup('show', show['path'], signature)
+        if cached is not None:
+            show['id'] = cached.get('id')
+            show['poster_path'] = cached.get('poster_path')
+            if show['id'] in self.changed['tv']:
+                self.refreshed += 1
+                self.resolve_seasons(catalog, show, signature, refresh=True)
+            else:
+                self.catalog_hits += 1
+                self.resolve_seasons(catalog, show)
+            self.updated(show)
+            return
+
+        self.catalog_misses += 1
+        # Ids tagged in the library or found in the offline index skip the search request
+        show_id = show.get('tmdb_id')
+        expected_year = None
+        if show_id is None and not show.get('imdb_id') and self.title_index:
+            show_id = self.title_index.lookup('tv', show['title'])
+            expected_year = title_year(show['title'])
+        if show_id is not None:
+            self.direct_lookups += 1
+            show['id'] = show_id
+            self.resolve_seasons(catalog, show, signature, expected_year=expected_year)
+        elif show.get('imdb_id'):
+            self.direct_lookups += 1
+            self.submit(self.tmdb_api.find_by_imdb_id, (show['imdb_id'],),
+                        partial(self.on_show_find, catalog, show, signature), show)
+        else:
+            self.search_show(catalog, show, signature)
+
+    def search_show(self, catalog, show, signature):
+        self.submit(self.tmdb_api.search_show, (show['title'],),
+                    partial(self.on_show_search, catalog, show, signature), show)
 
+    def on_show_search(self, catalog, show, signature, search_results):
+        if not (search_results and 'results' in search_results and search_results['results']):
+            return
+        show['poster_path'] = search_results['results'][0].get('poster_path')
+        show['id'] = search_results['results'][0].get('id')
+        catalog.store('show', show['path'], signature, show['id'],
+                      {'id': show['id'], 'poster_path': show['poster_path']})
+        self.resolve_seasons(catalog, show)
+
+    def on_show_find(self, catalog, show, signature, find_results):
+        if find_results and find_results.get('tv_results'):
+            self.on_show_search(catalog, show, signature, {'results': find_results['tv_results']})
+        else:
+            self.search_show(catalog, show, signature)
+
+    def resolve_seasons(self, catalog, show, show_signature=None, refresh=False, expected_year=None):
+        # Seasons missing from the catalog are fetched together with the show in one
+        # batched request instead of one request per season. When a show signature is
+        # given the show entry itself is (re)stored from the returned show details; when
+        # refreshing a changed show, every season is re-pulled as well. An expected year
+        # is checked against the show's first air date before anything is stored.
+        missing = {}
+        for season in show['seasons']:
+            season_number_match = re.search(r'\d+', season['name'])
+            if not season_number_match:
+                continue
+            season_number = int(season_number_match.group())
+
+            signature = file_signature(season['path'])
+            cached = None if refresh else catalog.lookup('season', season['path'], signature)
+            # A cached season is only usable if it was resolved against the same show.
+            if cached is not None and cached.get('show_id') == show['id']:
+                self.catalog_hits += 1
+                season['poster_path'] = cached.get('poster_path')
+                season['episodes_details'] = merge_episode_details(season, cached.get('episodes', []))
+                continue
+
+            self.catalog_misses += 1
+            missing.setdefault(season_number, []).append((season, signature))
+
+        if missing or show_signature is not None:
+            self.submit(self.tmdb_api.get_show_with_seasons, (show['id'], list(missing), refresh),
+                        partial(self.on_show_seasons, catalog, show, show_signature, refresh, missing, expected_year),
+                        show, refresh)
+
+    def on_show_seasons(self, catalog, show, show_signature, refresh, missing, expected_year, result):
+        show_details, seasons_details = result
+        if show_signature is not None:
+            if show_details and not release_year_matches(show_details.get('first_air_date'), expected_year):
+                # A different show that shares the original title; its seasons are discarded
+                show['id'] = None
+                self.search_show(catalog, show, show_signature)
+                return
+            if show_details:
+                show['poster_path'] = show_details.get('poster_path')
+                catalog.store('show', show['path'], show_signature, show['id'],
+                              {'id': show['id'], 'poster_path': show['poster_path']})
+            elif refresh:
+                self.refresh_failed = True
+            else:
+                # The id we went straight to did not resolve, so fall back to searching by title
+                show['id'] = None
+                self.search_show(catalog, show, show_signature)
+                return
+        if refresh and any(season_number not in seasons_details for season_number in missing):
+            self.refresh_failed = True
+        for season_number, season_details in seasons_details.items():
+            for season, signature in missing.get(season_number, []):
+                self.apply_season_details(catalog, show, season, signature, season_details)
+
+    def apply_season_details(self, catalog, show, season, signature, season_details):
+        season['poster_path'] = season_details.get('poster_path')
+        tmdb_episodes = [{
+            'episode_number': episode.get('episode_number'),
+            'name': episode.get('name'),
+            'still_path': episode.get('still_path')
+        } for episode in season_details.get('episodes', [])]
+        season['episodes_details'] = merge_episode_details(season, tmdb_episodes)
+        catalog.store('season', season['path'], signature, show['id'], {
+            'show_id': show['id'],
+            'poster_path': season['poster_path'],
+            'episodes': tmdb_episodes
+        })
+
+def release_year_matches(release_date, expected_year):
+    """Whether a TMDb 'YYYY-MM-DD' date falls in expected_year; true when either is unknown."""
+    if not expected_year or not release_date or not release_date[:4].isdigit():
+        return True
+    return int(release_date[:4]) == expected_year
+
+def merge_episode_details(season, tmdb_episodes):
+    """Attaches the local file path and artwork of each scanned episode to its TMDb episode details."""
+    local_episodes = {ep.get('episode_number'): ep for ep in season.get('episodes', []) if ep.get('episode_number') is not None}
+    processed_episodes = []
+    for episode in tmdb_episodes:
+        episode_num = episode.get('episode_number')
+        local_episode = local_episodes.get(episode_num, {})
+        processed_episodes.append({
+            'episode_number': episode_num,
+            'name': episode.get('name'),
+            'still_path': episode.get('still_path'),
+            'path': local_episode.get('path'), # Include the local path
+            'local_still': local_episode.get('local_still')
+        })
+    return processed_episodes
+
+class CacheEvictionWorker(QRunnable):
+    """
+    A QRunnable worker for one incremental step of disk cache maintenance: evicts a
+    batch of least recently used entries if the cache is over budget, and writes
+    the manifest if entries were added or removed. Access times from reads are left
+    for the save on shutdown. Cheap enough to run whenever the app is idle.
+    """
+    def run(self):
+        disk_cache = get_disk_cache()
+        evicted = disk_cache.evict()
+        if evicted:
+            print(f"Evicted {evicted} images from the disk cache ({disk_cache.total_bytes / 1024 / 1024:.1f} MB in use).")
+        disk_cache.save(access_times=False)